@@ -1,3 +1,3 @@
 """Scalar Agents Module"""
-from .financial_bodyguard import FinancialBodyguardOrchestrator, get_bodyguard, analyze
+from .financial_bodyguard import FinancialBodyguardOrchestrator, get_bodyguard, analyze, analyze_many
 from .tools import AVAILABLE_TOOLS, ToolResult
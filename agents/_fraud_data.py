@@ -0,0 +1,20 @@
+"""
+Scalar Fraud Data
+Fraud trajectory database, parsed once per process and shared by all agents
+"""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+
+TRAJECTORIES_PATH = Path(__file__).parent.parent / 'data' / 'fraud_trajectories.json'
+
+def load_trajectories() -> Dict:
+    """Load fraud trajectory database"""
+    if TRAJECTORIES_PATH.exists():
+        with open(TRAJECTORIES_PATH) as f:
+            return json.load(f)
+    return {"fraud_trajectories": []}
+
+FRAUD_DATA = load_trajectories()
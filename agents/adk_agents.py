@@ -5,9 +5,86 @@ Uses google.adk.agents.Agent for multi-agent fraud detection
 
 import json
 from pathlib import Path
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 from google.adk.agents import Agent
 
+from core.keyword_automaton import KeywordAutomaton
+from core.regex_cache import compile_re
+
+# =============================================================================
+# DETECTION PATTERNS (compiled once at import, one scan per message)
+# =============================================================================
+
+# Every detector's keyword groups, fused into one multi-pattern database
+# (group names are prefixed with the detector that reads them)
+DETECTOR_KEYWORDS = KeywordAutomaton({
+    # detect_upi_fraud
+    'upi.collect': ['collect', 'request', 'receive money', 'accept'],
+    'upi.lure': ['won', 'lottery', 'prize', 'cashback', 'refund'],
+    'upi.qr': ['qr'],
+    'upi.qr_action': ['scan', 'receive', 'payment'],
+    'upi.urgency': ['urgent', 'immediately', 'expire', '24 hours', 'hurry'],
+    # detect_phishing
+    'phishing.apk': ['.apk', 'download app'],
+    'phishing.short_url': ['bit.ly', 'tinyurl', 'goo.gl', 't.co'],
+    'phishing.kyc': ['kyc'],
+    'phishing.kyc_action': ['update', 'expire', 'block', 'verify'],
+    'phishing.screen_share': ['anydesk', 'teamviewer', 'quicksupport', 'screen share'],
+    # detect_impersonation
+    'impersonation.authorities': ['police', 'cbi', 'ed', 'enforcement', 'customs', 'income tax', 'court', 'warrant', 'fir'],
+    'impersonation.threats': ['arrest', 'jail', 'custody', 'case', 'investigation', 'money laundering'],
+    'impersonation.money': ['pay', 'transfer', 'fine', 'penalty', 'deposit', 'rs', '₹', 'lakh', 'crore'],
+    'impersonation.digital_arrest': ['video call', 'digital arrest', 'do not disconnect', 'don\'t tell anyone'],
+    # detect_investment_fraud
+    'investment.scam_words': ['guaranteed', 'risk-free', 'double your money', 'no loss', 'fixed return', '100% profit'],
+    'investment.red_flags': ['crypto', 'forex', 'trading', 'referral bonus', 'daily profit', 'monthly return'],
+})
+
+# Unrealistic periodic return claims, e.g. "5% daily"
+PCT_RETURN_RE = compile_re(r'(\d+)\s*%\s*(daily|weekly|monthly|per month)')
+
+
+@lru_cache(maxsize=256)
+def scan_message(message: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Scan a message for all detectors' keywords in one pass.
+    
+    The root agent usually runs several detectors over the same message,
+    so the scan is cached and shared between them.
+    """
+    hits = DETECTOR_KEYWORDS.scan(message.lower())
+    return {group: tuple(matched) for group, matched in hits.items()}
+
+
+def _impersonation_score(auth_hits: int, threat_hits: int, money: bool, digital_arrest: bool) -> float:
+    """Impersonation risk from capped hit counts"""
+    risk_score = 0.0
+    if auth_hits > 0:
+        risk_score += 0.3 * min(auth_hits, 3)
+    if threat_hits > 0:
+        risk_score += 0.25 * min(threat_hits, 3)
+    if money:
+        risk_score += 0.35
+    if digital_arrest:
+        risk_score = min(risk_score + 0.3, 1.0)
+    return min(risk_score, 1.0)
+
+
+# Hit counts saturate at 3, so every possible score fits in a 4x4x2x2 table:
+# IMPERSONATION_SCORES[auth][threat][money][digital_arrest]
+IMPERSONATION_SCORES = tuple(
+    tuple(
+        tuple(
+            tuple(_impersonation_score(auth, threat, money, digital) for digital in (False, True))
+            for money in (False, True)
+        )
+        for threat in range(4)
+    )
+    for auth in range(4)
+)
+
+
 # =============================================================================
 # FRAUD DETECTION TOOLS (Functions that agents can call)
 # =============================================================================
@@ -22,25 +99,24 @@ def detect_upi_fraud(message: str) -> dict:
     Returns:
         dict: Detection result with risk_score, threat_type, and recommendation.
     """
-    message_lower = message.lower()
+    hits = scan_message(message)
     
     # UPI scam patterns
     risk_score = 0.0
     threats = []
     
     # Collect request scam
-    if any(kw in message_lower for kw in ['collect', 'request', 'receive money', 'accept']):
-        if any(kw in message_lower for kw in ['won', 'lottery', 'prize', 'cashback', 'refund']):
-            risk_score = 0.95
-            threats.append("UPI Collect Request Scam - Money will be DEBITED, not credited!")
+    if hits['upi.collect'] and hits['upi.lure']:
+        risk_score = 0.95
+        threats.append("UPI Collect Request Scam - Money will be DEBITED, not credited!")
     
     # QR code scam
-    if 'qr' in message_lower and any(kw in message_lower for kw in ['scan', 'receive', 'payment']):
+    if hits['upi.qr'] and hits['upi.qr_action']:
         risk_score = max(risk_score, 0.92)
         threats.append("QR Code Fraud - Scanning QR debits money from YOUR account!")
     
     # Urgency pressure
-    if any(kw in message_lower for kw in ['urgent', 'immediately', 'expire', '24 hours', 'hurry']):
+    if hits['upi.urgency']:
         risk_score = min(risk_score + 0.05, 1.0)
         threats.append("Urgency pressure tactic detected")
     
@@ -64,28 +140,28 @@ def detect_phishing(message: str) -> dict:
     Returns:
         dict: Detection result with phishing indicators and risk level.
     """
-    message_lower = message.lower()
+    hits = scan_message(message)
     
     risk_score = 0.0
     indicators = []
     
     # APK download
-    if '.apk' in message_lower or 'download app' in message_lower:
+    if hits['phishing.apk']:
         risk_score = 0.98
         indicators.append("APK Download - MALWARE! Banks never send APK links!")
     
     # Shortened URLs
-    if any(url in message_lower for url in ['bit.ly', 'tinyurl', 'goo.gl', 't.co']):
+    if hits['phishing.short_url']:
         risk_score = max(risk_score, 0.85)
         indicators.append("Shortened URL - Hiding real destination!")
     
     # KYC scam
-    if 'kyc' in message_lower and any(kw in message_lower for kw in ['update', 'expire', 'block', 'verify']):
+    if hits['phishing.kyc'] and hits['phishing.kyc_action']:
         risk_score = max(risk_score, 0.90)
         indicators.append("Fake KYC Scam - Banks don't send SMS for KYC!")
     
     # Screen sharing
-    if any(app in message_lower for app in ['anydesk', 'teamviewer', 'quicksupport', 'screen share']):
+    if hits['phishing.screen_share']:
         risk_score = 0.96
         indicators.append("Screen Sharing Request - NEVER share screen with strangers!")
     
@@ -109,34 +185,19 @@ def detect_impersonation(message: str) -> dict:
     Returns:
         dict: Detection result showing impersonation indicators.
     """
-    message_lower = message.lower()
+    hits = scan_message(message)
     
-    authorities = ['police', 'cbi', 'ed', 'enforcement', 'customs', 'income tax', 'court', 'warrant', 'fir']
-    threats = ['arrest', 'jail', 'custody', 'case', 'investigation', 'money laundering']
-    money = ['pay', 'transfer', 'fine', 'penalty', 'deposit', 'rs', '₹', 'lakh', 'crore']
+    auth_hits = min(len(hits['impersonation.authorities']), 3)
+    threat_hits = min(len(hits['impersonation.threats']), 3)
+    money = bool(hits['impersonation.money'])
+    digital_arrest = bool(hits['impersonation.digital_arrest'])
     
-    auth_hits = sum(1 for a in authorities if a in message_lower)
-    threat_hits = sum(1 for t in threats if t in message_lower)
-    money_hits = sum(1 for m in money if m in message_lower)
-    
-    risk_score = 0.0
-    if auth_hits > 0:
-        risk_score += 0.3 * min(auth_hits, 3)
-    if threat_hits > 0:
-        risk_score += 0.25 * min(threat_hits, 3)
-    if money_hits > 0:
-        risk_score += 0.35
-    
-    # Digital arrest indicator
-    if any(term in message_lower for term in ['video call', 'digital arrest', 'do not disconnect', 'don\'t tell anyone']):
-        risk_score = min(risk_score + 0.3, 1.0)
-    
-    risk_score = min(risk_score, 1.0)
+    risk_score = IMPERSONATION_SCORES[auth_hits][threat_hits][money][digital_arrest]
     
     return {
         "status": "success",
         "risk_score": risk_score,
-        "authority_claims": [a for a in authorities if a in message_lower],
+        "authority_claims": list(hits['impersonation.authorities']),
         "is_impersonation": risk_score >= 0.7,
         "recommendation": "HANG UP! Real police NEVER demands money over phone!" if risk_score >= 0.7 else "Low risk",
         "hindi": "🚨 फोन काटें! असली पुलिस फोन पर पैसे नहीं मांगती! हेल्पलाइन: 1930" if risk_score >= 0.7 else "कम जोखिम"
@@ -154,26 +215,21 @@ def detect_investment_fraud(message: str) -> dict:
         dict: Detection result with fraud indicators.
     """
     message_lower = message.lower()
-    
-    scam_words = ['guaranteed', 'risk-free', 'double your money', 'no loss', 'fixed return', '100% profit']
-    red_flags = ['crypto', 'forex', 'trading', 'referral bonus', 'daily profit', 'monthly return']
+    hits = scan_message(message)
     
     risk_score = 0.0
     indicators = []
     
-    for word in scam_words:
-        if word in message_lower:
-            risk_score = max(risk_score, 0.90)
-            indicators.append(f"Scam indicator: '{word}'")
+    for word in hits['investment.scam_words']:
+        risk_score = max(risk_score, 0.90)
+        indicators.append(f"Scam indicator: '{word}'")
     
-    for flag in red_flags:
-        if flag in message_lower:
-            risk_score = max(risk_score, 0.80)
-            indicators.append(f"Red flag: '{flag}'")
+    for flag in hits['investment.red_flags']:
+        risk_score = max(risk_score, 0.80)
+        indicators.append(f"Red flag: '{flag}'")
     
     # Check for unrealistic return percentages
-    import re
-    if re.search(r'(\d+)\s*%\s*(daily|weekly|monthly|per month)', message_lower):
+    if '%' in message_lower and PCT_RETURN_RE.search(message_lower):
         risk_score = 0.95
         indicators.append("Unrealistic return percentage claimed!")
     
@@ -9,17 +9,25 @@ Uses Google ADK multi-agent patterns:
 """
 
 import asyncio
-import json
+import math
+import sys
+import threading
+from array import array
+from bisect import bisect_right
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-from datetime import datetime
-from pathlib import Path
+from dataclasses import dataclass, field, replace
 
 from core.adk_core import (
     BaseAgent, AgentRole, Task, TaskResult, TaskStatus,
-    AgentContext, MultiAgentOrchestrator, ToolRegistry
+    AgentContext, MultiAgentOrchestrator, ToolRegistry, ResponseBudget, utc_timestamp
 )
+from core.keyword_automaton import KeywordAutomaton
+from core.analysis_cache import LRUCache, copy_result
+from agents._fraud_data import TRAJECTORIES_PATH, FRAUD_DATA
 from agents.specialists import (
+    MessageFeatures,
+    extract_features,
+    extract_features_many,
     UPIFraudAgent,
     PhishingAgent,
     ImpersonationAgent,
@@ -27,11 +35,44 @@ from agents.specialists import (
     InvestmentFraudAgent
 )
 
-# Load trajectories for context
-TRAJECTORIES_PATH = Path(__file__).parent.parent / 'data' / 'fraud_trajectories.json'
+# Routing triggers per specialist, in consultation order
+ROUTING_KEYWORDS = {
+    'upi': ['upi', 'collect', 'pay', 'gpay', 'phonepe', 'paytm', 'qr', '₹', 'rs'],
+    'phishing': ['kyc', 'update', 'verify', 'bank', 'apk', 'download', 'link', 'click'],
+    'impersonation': ['police', 'cbi', 'ed', 'arrest', 'warrant', 'customs', 'parcel'],
+    'document': ['loan', 'emi', 'insurance', 'policy', 'premium', 'interest rate'],
+    'investment': ['invest', 'return', 'profit', 'trading', 'crypto', 'forex', 'double']
+}
+ROUTING_ORDER = tuple(ROUTING_KEYWORDS)
+DEFAULT_AGENTS = ['upi', 'phishing', 'impersonation']
 
+# Aggregate threat levels: a risk at or above THREAT_THRESHOLDS[i] rates
+# THREAT_LEVELS[i + 1]. LOW starts strictly above 0.1, hence nextafter.
+THREAT_THRESHOLDS = (math.nextafter(0.1, 1.0), 0.4, 0.7, 0.9)
+THREAT_LEVELS = ('SAFE', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
 
-@dataclass
+# keyword -> bitmask of the specialists it triggers (bit i = ROUTING_ORDER[i])
+ROUTING_MASKS: Dict[str, int] = {}
+for _bit, _agent_id in enumerate(ROUTING_ORDER):
+    for _keyword in ROUTING_KEYWORDS[_agent_id]:
+        ROUTING_MASKS[_keyword] = ROUTING_MASKS.get(_keyword, 0) | (1 << _bit)
+
+
+@dataclass(slots=True, frozen=True)
+class AggregatedRisk:
+    """Combined verdict of the specialists consulted for one message"""
+    threat_level: str
+    risk_score: float
+    primary_threat: Optional[str]
+    agent_count: int = 0
+    all_risks: List[float] = field(default_factory=list)
+
+
+# Verdict when no specialist was consulted
+NO_FINDINGS = AggregatedRisk(threat_level='SAFE', risk_score=0.0, primary_threat=None)
+
+
+@dataclass(slots=True, frozen=True)
 class ProtectionResult:
     """Result from Financial Bodyguard analysis"""
     threat_level: str  # SAFE, LOW, MEDIUM, HIGH, CRITICAL
@@ -91,6 +132,33 @@ class FinancialBodyguardOrchestrator(BaseAgent):
         # Load fraud trajectories
         self.trajectories = self._load_trajectories()
         
+        self._index_trajectories()
+        
+        # Pre-screen: if none of these occur, routing falls back to the default
+        # agents, none of them finds anything and no trajectory can match, so
+        # the result is the same SAFE verdict for every such message
+        self._prescreen_keywords = frozenset([
+            *ROUTING_MASKS,
+            *(kw for agent_id in DEFAULT_AGENTS for kw in self.specialists[agent_id].trigger_keywords),
+            *self._flag_owners
+        ])
+        
+        # Every keyword any stage looks for, so one scan per message feeds
+        # routing, the pre-screen, all specialists and trajectory matching
+        self._message_keywords = KeywordAutomaton({
+            'prescreen': self._prescreen_keywords,
+            **{
+                agent_id: agent.keyword_automaton.keywords
+                for agent_id, agent in self.specialists.items()
+            }
+        })
+        self._safe_result: Optional[ProtectionResult] = None
+        self._safe_result = self._analyze_uncached('', 0)
+        
+        # Repeated messages (forwarded scam SMS) reuse the first analysis;
+        # keyed by (content, age decade)
+        self._results = LRUCache(maxsize=4096)
+        
         # Stats
         self.stats = {
             'total_analyses': 0,
@@ -100,11 +168,22 @@ class FinancialBodyguardOrchestrator(BaseAgent):
     
     def _load_trajectories(self) -> List[Dict]:
         """Load fraud trajectory database"""
-        if TRAJECTORIES_PATH.exists():
-            with open(TRAJECTORIES_PATH) as f:
-                data = json.load(f)
-                return data.get('fraud_trajectories', [])
-        return []
+        return FRAUD_DATA.get('fraud_trajectories', [])
+    
+    def _index_trajectories(self):
+        """
+        Flatten trajectory red flags into parallel arrays for matching
+        
+        Every lowercased flag is interned once; `_flag_owners` maps it to a
+        compact int array of the trajectories listing it (repeated if a
+        trajectory lists it twice), so match counting is one pass over the
+        flags a scan found.
+        """
+        self._flag_owners: Dict[str, array] = {}
+        for index, trajectory in enumerate(self.trajectories):
+            for rf in trajectory.get('red_flags', []):
+                flag = sys.intern(rf.lower())
+                self._flag_owners.setdefault(flag, array('i')).append(index)
     
     @property
     def system_instruction(self) -> str:
@@ -133,61 +212,121 @@ Golden rules:
         """
         Main analysis method - coordinates all specialists
         
-        Uses parallel execution for speed, then aggregates results
+        Uses parallel execution for speed, then aggregates results. The
+        analysis is a pure function of the content and the user's age decade,
+        so results are memoized; each call gets its own copy of the findings
+        with a fresh timestamp.
         """
+        key = (content, user_age // 10)
+        result = self._results.get(key)
+        if result is None:
+            result = self._analyze_uncached(*key)
+            self._results.put(key, result)
+        
+        self._record(result)
+        return replace(copy_result(result), timestamp=utc_timestamp())
+    
+    def analyze_many(self, contents: List[str], user_age: int = 45) -> List[ProtectionResult]:
+        """
+        analyze() for a batch of messages from users of the same age
+        
+        Messages not already cached are lowercased and keyword-scanned
+        together in one engine pass; duplicates in the batch are analyzed
+        once. Results come back in the order of `contents`.
+        """
+        age_decade = user_age // 10
+        results: Dict[str, Optional[ProtectionResult]] = {}
+        for content in contents:
+            if content not in results:
+                results[content] = self._results.get((content, age_decade))
+        
+        pending = [content for content, result in results.items() if result is None]
+        for content, features in zip(pending, self.extract_features_many(pending)):
+            result = self._analyze_uncached(content, age_decade, features)
+            self._results.put((content, age_decade), result)
+            results[content] = result
+        
+        timestamp = utc_timestamp()
+        batch = []
+        for content in contents:
+            self._record(results[content])
+            batch.append(replace(copy_result(results[content]), timestamp=timestamp))
+        return batch
+    
+    def _record(self, result: ProtectionResult):
+        """Count one analysis in the stats"""
         self.stats['total_analyses'] += 1
+        if result.threat_level in ['HIGH', 'CRITICAL']:
+            self.stats['threats_detected'] += 1
+        if result.threat_level == 'CRITICAL':
+            self.stats['critical_blocks'] += 1
+    
+    def _analyze_uncached(
+        self,
+        content: str,
+        age_decade: int,
+        features: Optional[MessageFeatures] = None
+    ) -> ProtectionResult:
+        """Run the specialists over content; timestamp is filled in by analyze()"""
+        user_age = age_decade * 10
+        
+        # Lowercase and keyword-scan once - shared by routing, every specialist
+        # and trajectory matching
+        if features is None:
+            features = self.extract_features(content)
+        
+        # Benign message - skip the specialists entirely (SAFE advice ignores age).
+        # Only for ASCII text: the specialists' IGNORECASE regexes also match
+        # non-ASCII letters such as 'ſ' that the keyword scan does not fold
+        if (self._safe_result is not None and features.content_lower.isascii()
+                and features.keywords.isdisjoint(self._prescreen_keywords)):
+            return self._safe_result
         
         # Determine which agents to consult based on content
-        agents_to_use = self._route_to_agents(content)
+        agents_to_use = self._route_to_agents(content, features)
         
-        # Run selected agents (simulated parallel)
-        agent_results = []
-        for agent_id in agents_to_use:
-            agent = self.specialists.get(agent_id)
-            if agent:
-                result = agent.analyze(content)
-                agent_results.append(result)
+        # Run selected agents inline - they are pure CPU-bound Python, so threads
+        # would only add hand-off overhead under the GIL
+        agent_results = [
+            self.specialists[a].analyze(content, features=features)
+            for a in agents_to_use if a in self.specialists
+        ]
         
         # Aggregate results
         aggregated = self._aggregate_results(agent_results)
         
         # Find matching trajectory
-        matched_trajectory = self._match_trajectory(content, aggregated)
+        matched_trajectory = self._match_trajectory(content, aggregated, features)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
-            aggregated['threat_level'],
-            aggregated['risk_score'],
+            aggregated.threat_level,
+            aggregated.risk_score,
             user_age
         )
         
         # Generate summaries
         summary, hindi = self._generate_summaries(aggregated, matched_trajectory)
         
-        # Update stats
-        if aggregated['threat_level'] in ['HIGH', 'CRITICAL']:
-            self.stats['threats_detected'] += 1
-        if aggregated['threat_level'] == 'CRITICAL':
-            self.stats['critical_blocks'] += 1
-        
         return ProtectionResult(
-            threat_level=aggregated['threat_level'],
-            risk_score=aggregated['risk_score'],
-            primary_threat=aggregated.get('primary_threat'),
+            threat_level=aggregated.threat_level,
+            risk_score=aggregated.risk_score,
+            primary_threat=aggregated.primary_threat,
             summary=summary,
             hindi_summary=hindi,
             recommendations=recommendations,
             agent_findings=agent_results,
             matched_trajectory=matched_trajectory,
-            emergency_action=aggregated['threat_level'] == 'CRITICAL',
-            timestamp=datetime.utcnow().isoformat()
+            emergency_action=aggregated.threat_level == 'CRITICAL',
+            timestamp=''
         )
     
     async def analyze_async(self, content: str, user_age: int = 45) -> ProtectionResult:
         """Async version with true parallel execution"""
         self.stats['total_analyses'] += 1
         
-        agents_to_use = self._route_to_agents(content)
+        features = self.extract_features(content)
+        agents_to_use = self._route_to_agents(content, features)
         
         # Create tasks for parallel execution
         tasks = []
@@ -201,7 +340,11 @@ Golden rules:
                     context=AgentContext(
                         session_id="live",
                         user_age_group=f"{user_age}+"
-                    )
+                    ),
+                    # Lowercased and scanned once above, shared by every specialist
+                    metadata={'features': features},
+                    # Specialists only add a short explanation to their verdict
+                    response_budget=ResponseBudget.MEDIUM
                 )
                 tasks.append(agent.execute_async(task))
         
@@ -213,117 +356,96 @@ Golden rules:
         
         # Rest same as sync version
         aggregated = self._aggregate_results(agent_results)
-        matched_trajectory = self._match_trajectory(content, aggregated)
+        matched_trajectory = self._match_trajectory(content, aggregated, features)
         recommendations = self._generate_recommendations(
-            aggregated['threat_level'],
-            aggregated['risk_score'],
+            aggregated.threat_level,
+            aggregated.risk_score,
             user_age
         )
         summary, hindi = self._generate_summaries(aggregated, matched_trajectory)
         
         return ProtectionResult(
-            threat_level=aggregated['threat_level'],
-            risk_score=aggregated['risk_score'],
-            primary_threat=aggregated.get('primary_threat'),
+            threat_level=aggregated.threat_level,
+            risk_score=aggregated.risk_score,
+            primary_threat=aggregated.primary_threat,
             summary=summary,
             hindi_summary=hindi,
             recommendations=recommendations,
             agent_findings=agent_results,
             matched_trajectory=matched_trajectory,
-            emergency_action=aggregated['threat_level'] == 'CRITICAL',
-            timestamp=datetime.utcnow().isoformat()
+            emergency_action=aggregated.threat_level == 'CRITICAL',
+            timestamp=utc_timestamp()
         )
     
-    def _route_to_agents(self, content: str) -> List[str]:
+    def extract_features(self, content: str) -> MessageFeatures:
+        """Lowercase content and find every keyword the pipeline checks, in one scan"""
+        return extract_features(content, self._message_keywords)
+    
+    def extract_features_many(self, contents: List[str]) -> List[MessageFeatures]:
+        """extract_features() for a batch of messages, in one scan"""
+        return extract_features_many(contents, self._message_keywords)
+    
+    def _route_to_agents(self, content: str, features: Optional[MessageFeatures] = None) -> List[str]:
         """
         Smart routing - determine which agents should analyze content
         
         Uses keyword matching for speed, AI for complex cases
         """
-        content_lower = content.lower()
-        agents = []
-        
-        # UPI agent triggers
-        if any(kw in content_lower for kw in ['upi', 'collect', 'pay', 'gpay', 'phonepe', 'paytm', 'qr', '₹', 'rs']):
-            agents.append('upi')
-        
-        # Phishing agent triggers
-        if any(kw in content_lower for kw in ['kyc', 'update', 'verify', 'bank', 'apk', 'download', 'link', 'click']):
-            agents.append('phishing')
-        
-        # Impersonation agent triggers
-        if any(kw in content_lower for kw in ['police', 'cbi', 'ed', 'arrest', 'warrant', 'customs', 'parcel']):
-            agents.append('impersonation')
-        
-        # Document agent triggers
-        if any(kw in content_lower for kw in ['loan', 'emi', 'insurance', 'policy', 'premium', 'interest rate']):
-            agents.append('document')
-        
-        # Investment agent triggers
-        if any(kw in content_lower for kw in ['invest', 'return', 'profit', 'trading', 'crypto', 'forex', 'double']):
-            agents.append('investment')
+        if features is None:
+            features = self.extract_features(content)
+        mask = 0
+        for keyword in features.keywords:
+            mask |= ROUTING_MASKS.get(keyword, 0)
         
         # If no specific match, use core fraud detection agents
-        if not agents:
-            agents = ['upi', 'phishing', 'impersonation']
+        if not mask:
+            return list(DEFAULT_AGENTS)
         
-        return agents
+        return [agent_id for bit, agent_id in enumerate(ROUTING_ORDER) if mask >> bit & 1]
     
-    def _aggregate_results(self, results: List[Dict]) -> Dict[str, Any]:
+    def _aggregate_results(self, results: List[Dict]) -> AggregatedRisk:
         """Aggregate results from multiple agents"""
         if not results:
-            return {
-                'threat_level': 'SAFE',
-                'risk_score': 0.0,
-                'primary_threat': None
-            }
+            return NO_FINDINGS
         
-        # Find highest risk
-        max_risk = max(r.get('risk_score', 0) for r in results)
-        
-        # Get primary threat from highest risk agent
-        primary_threat = None
-        for r in results:
-            if r.get('risk_score', 0) == max_risk:
-                primary_threat = r.get('agent', 'unknown')
-                break
-        
-        # Determine threat level
-        if max_risk >= 0.9:
-            threat_level = 'CRITICAL'
-        elif max_risk >= 0.7:
-            threat_level = 'HIGH'
-        elif max_risk >= 0.4:
-            threat_level = 'MEDIUM'
-        elif max_risk > 0.1:
-            threat_level = 'LOW'
-        else:
-            threat_level = 'SAFE'
+        all_risks = [r.get('risk_score', 0) for r in results]
         
-        return {
-            'threat_level': threat_level,
-            'risk_score': max_risk,
-            'primary_threat': primary_threat,
-            'agent_count': len(results),
-            'all_risks': [r.get('risk_score', 0) for r in results]
-        }
+        # Primary threat is the first agent with the highest risk
+        primary_index = max(range(len(all_risks)), key=all_risks.__getitem__)
+        max_risk = all_risks[primary_index]
+        primary_threat = results[primary_index].get('agent', 'unknown')
+        
+        threat_level = THREAT_LEVELS[bisect_right(THREAT_THRESHOLDS, max_risk)]
+        
+        return AggregatedRisk(
+            threat_level=threat_level,
+            risk_score=max_risk,
+            primary_threat=primary_threat,
+            agent_count=len(results),
+            all_risks=all_risks
+        )
     
-    def _match_trajectory(self, content: str, aggregated: Dict) -> Optional[Dict]:
+    def _match_trajectory(
+        self,
+        content: str,
+        aggregated: AggregatedRisk,
+        features: Optional[MessageFeatures] = None
+    ) -> Optional[Dict]:
         """Match content against known fraud trajectories"""
-        content_lower = content.lower()
+        if features is None:
+            features = self.extract_features(content)
         
-        best_match = None
-        best_score = 0
+        if not self.trajectories:
+            return None
         
-        for trajectory in self.trajectories:
-            red_flags = trajectory.get('red_flags', [])
-            matches = sum(1 for rf in red_flags if rf.lower() in content_lower)
-            
-            if matches > best_score:
-                best_score = matches
-                best_match = trajectory
+        counts = [0] * len(self.trajectories)
+        for flag in features.keywords:
+            for index in self._flag_owners.get(flag, ()):
+                counts[index] += 1
         
-        return best_match if best_score >= 2 else None
+        # max() keeps the first of equal counts, so ties go to the earlier trajectory
+        best_index = max(range(len(counts)), key=counts.__getitem__)
+        return self.trajectories[best_index] if counts[best_index] >= 2 else None
     
     def _generate_recommendations(
         self, 
@@ -373,12 +495,12 @@ Golden rules:
     
     def _generate_summaries(
         self, 
-        aggregated: Dict, 
+        aggregated: AggregatedRisk, 
         trajectory: Optional[Dict]
     ) -> tuple:
         """Generate English and Hindi summaries"""
         
-        threat_level = aggregated['threat_level']
+        threat_level = aggregated.threat_level
         
         if threat_level == 'CRITICAL':
             summary = "🚨 CRITICAL THREAT! This is almost certainly a scam. Do NOT proceed!"
@@ -415,12 +537,16 @@ Golden rules:
 # =============================================================================
 
 _bodyguard: Optional[FinancialBodyguardOrchestrator] = None
+_bodyguard_lock = threading.Lock()
 
 def get_bodyguard() -> FinancialBodyguardOrchestrator:
     """Get singleton Financial Bodyguard instance"""
     global _bodyguard
+    # Double-checked: lock-free once built, one construction under concurrent first calls
     if _bodyguard is None:
-        _bodyguard = FinancialBodyguardOrchestrator()
+        with _bodyguard_lock:
+            if _bodyguard is None:
+                _bodyguard = FinancialBodyguardOrchestrator()
     return _bodyguard
 
 
@@ -429,6 +555,11 @@ def analyze(content: str, user_age: int = 45) -> ProtectionResult:
     return get_bodyguard().analyze(content, user_age)
 
 
+def analyze_many(contents: List[str], user_age: int = 45) -> List[ProtectionResult]:
+    """Quick batch analyze function"""
+    return get_bodyguard().analyze_many(contents, user_age)
+
+
 async def analyze_async(content: str, user_age: int = 45) -> ProtectionResult:
     """Async analyze function"""
     return await get_bodyguard().analyze_async(content, user_age)
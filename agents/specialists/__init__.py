@@ -3,34 +3,71 @@ Scalar Specialist Agents
 Individual agents for specific fraud detection domains
 """
 
-import json
 import re
-from pathlib import Path
-from typing import Dict, List, Any, Optional
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Set
 
 from core.adk_core import (
     BaseAgent, AgentRole, Task, TaskResult, TaskStatus,
     ToolRegistry
 )
+from core.keyword_automaton import KeywordAutomaton, literal_prefix
+from core.analysis_cache import cached_analysis
+from core.regex_cache import compile_re, compile_linear
 
+# Fraud trajectories (parsed once, shared with the orchestrator)
+from agents._fraud_data import TRAJECTORIES_PATH, load_trajectories, FRAUD_DATA
 
-# Load fraud trajectories
-TRAJECTORIES_PATH = Path(__file__).parent.parent.parent / 'data' / 'fraud_trajectories.json'
 
-def load_trajectories() -> Dict:
-    """Load fraud trajectory database"""
-    if TRAJECTORIES_PATH.exists():
-        with open(TRAJECTORIES_PATH) as f:
-            return json.load(f)
-    return {"fraud_trajectories": []}
+# =============================================================================
+# SHARED MESSAGE FEATURES
+# =============================================================================
+
+@dataclass(slots=True, frozen=True)
+class MessageFeatures:
+    """
+    Per-message features computed once and read by every specialist
+    
+    `keywords` holds the keywords found in `content_lower`; it must have been
+    scanned with a vocabulary covering the reading specialist's
+    `keyword_automaton`, as the orchestrator's combined scan does.
+    """
+    content_lower: str
+    keywords: Set[str]
+
+
+def extract_features(content: str, automaton: KeywordAutomaton) -> MessageFeatures:
+    """Lowercase content and scan it once with automaton"""
+    content_lower = content.lower()
+    return MessageFeatures(content_lower, automaton.find(content_lower))
 
-FRAUD_DATA = load_trajectories()
+
+def extract_features_many(contents: List[str], automaton: KeywordAutomaton) -> List[MessageFeatures]:
+    """extract_features() for a batch of messages, scanned together"""
+    lowered = [content.lower() for content in contents]
+    return [
+        MessageFeatures(content_lower, keywords)
+        for content_lower, keywords in zip(lowered, automaton.find_many(lowered))
+    ]
 
 
 # =============================================================================
 # UPI FRAUD SPECIALIST
 # =============================================================================
 
+# A risk at or above UPI_THREAT_THRESHOLDS[i] rates UPI_THREAT_LEVELS[i + 1]
+UPI_THREAT_THRESHOLDS = (0.4, 0.7, 0.9)
+UPI_THREAT_LEVELS = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+# (action, hindi) advice per threat level
+UPI_ADVICE = {
+    'CRITICAL': ('DO NOT proceed. This is a scam!', 'धोखाधड़ी! आगे न बढ़ें!'),
+    'HIGH': ('High risk of fraud. Do not accept or pay.', 'उच्च जोखिम! स्वीकार न करें!'),
+    'MEDIUM': ('Exercise caution. Verify before proceeding.', 'सावधान! पहले जाँच करें.'),
+    'LOW': ('Appears safe, but stay vigilant.', 'सुरक्षित लगता है.'),
+}
+
 class UPIFraudAgent(BaseAgent):
     """
     Specialist agent for UPI/payment fraud detection
@@ -56,6 +93,13 @@ class UPIFraudAgent(BaseAgent):
             if t.get('detection_agent') in ['upi_fraud_agent', 'marketplace_agent']
         ]
         
+        # red flag -> positions of the trajectories listing it, so matching
+        # unions a few small lists instead of scanning every trajectory
+        self._trajectory_index: Dict[str, List[int]] = {}
+        for position, t in enumerate(self.trajectories):
+            for flag in dict.fromkeys(t.get('red_flags', [])):
+                self._trajectory_index.setdefault(flag, []).append(position)
+        
         # Pattern database
         self.patterns = {
             'collect_scam': {
@@ -79,6 +123,41 @@ class UPIFraudAgent(BaseAgent):
                 'risk': 0.88
             }
         }
+        
+        self.urgency_words = ['urgent', 'immediately', 'now', 'hurry', 'fast', 'limited', 'expire', 'last chance']
+        self._urgency_set = frozenset(self.urgency_words)
+        
+        # Column views of self.patterns, aligned by position, so analyze() walks
+        # flat tuples instead of nested dict fields. Ordered by descending base
+        # risk so the most dangerous patterns are scored and reported first.
+        ranked = sorted(self.patterns.items(), key=lambda item: -item[1]['risk'])
+        # Keywords are held as sets - hits are one C-level intersection with
+        # the message's keyword set (the lists contain no duplicates)
+        self._pattern_names = tuple(name for name, _ in ranked)
+        self._pattern_keyword_sets = tuple(frozenset(d['keywords']) for _, d in ranked)
+        self._pattern_indicator_sets = tuple(frozenset(d['indicators']) for _, d in ranked)
+        
+        # Pattern risk depends only on the hit counts, which are bounded by the
+        # list sizes: _pattern_scores[pattern_index][keyword_hits][indicator_hits]
+        self._pattern_scores = tuple(
+            [
+                [
+                    min(data['risk'] * (0.7 + 0.15 * keyword_hits + 0.15 * indicator_hits), 1.0)
+                    for indicator_hits in range(len(data['indicators']) + 1)
+                ]
+                for keyword_hits in range(len(data['keywords']) + 1)
+            ]
+            for _, data in ranked
+        )
+        
+        self.keyword_automaton = KeywordAutomaton({
+            **{
+                f'{name}.{part}': data[part]
+                for name, data in self.patterns.items()
+                for part in ('keywords', 'indicators')
+            },
+            'urgency': self.urgency_words
+        })
     
     @property
     def system_instruction(self) -> str:
@@ -112,100 +191,131 @@ Key rules:
     def tools(self) -> List[str]:
         return ['upi_pattern_matcher', 'risk_calculator']
     
-    def analyze(self, content: str) -> Dict[str, Any]:
+    @property
+    def trigger_keywords(self) -> List[str]:
+        """Literals at least one of which must occur for analyze() to find anything"""
+        return list(self.keyword_automaton.keywords)
+    
+    @cached_analysis()
+    def analyze(self, content: str, features: Optional[MessageFeatures] = None) -> Dict[str, Any]:
         """Analyze content for UPI fraud"""
-        content_lower = content.lower()
+        if features is None:
+            features = extract_features(content, self.keyword_automaton)
+        found = features.keywords
         
         detected_patterns = []
         max_risk = 0.0
-        red_flags = []
-        
-        for pattern_name, pattern_data in self.patterns.items():
-            keyword_hits = sum(1 for kw in pattern_data['keywords'] if kw in content_lower)
-            indicator_hits = sum(1 for ind in pattern_data['indicators'] if ind in content_lower)
+        red_flags: Set[str] = set()
+        
+        for pattern_name, keyword_set, indicator_set, scores in zip(
+            self._pattern_names, self._pattern_keyword_sets,
+            self._pattern_indicator_sets, self._pattern_scores
+        ):
+            matched_keywords = keyword_set.intersection(found)
+            if not matched_keywords:
+                continue
+            matched_indicators = indicator_set.intersection(found)
+            if not matched_indicators:
+                continue
             
-            if keyword_hits > 0 and indicator_hits > 0:
-                risk = pattern_data['risk'] * (0.7 + 0.15 * keyword_hits + 0.15 * indicator_hits)
-                risk = min(risk, 1.0)
-                
-                detected_patterns.append({
-                    'name': pattern_name,
-                    'risk': risk,
-                    'keywords': keyword_hits,
-                    'indicators': indicator_hits
-                })
-                
-                max_risk = max(max_risk, risk)
-                red_flags.extend([kw for kw in pattern_data['keywords'] if kw in content_lower])
-                red_flags.extend([ind for ind in pattern_data['indicators'] if ind in content_lower])
-        
-        # Check for urgency amplifiers
-        urgency_words = ['urgent', 'immediately', 'now', 'hurry', 'fast', 'limited', 'expire', 'last chance']
-        urgency_hits = sum(1 for w in urgency_words if w in content_lower)
-        if urgency_hits > 0:
-            max_risk = min(max_risk + 0.05 * urgency_hits, 1.0)
-            red_flags.append('urgency_pressure')
+            keyword_hits = len(matched_keywords)
+            indicator_hits = len(matched_indicators)
+            risk = scores[keyword_hits][indicator_hits]
+            
+            detected_patterns.append({
+                'name': pattern_name,
+                'risk': risk,
+                'keywords': keyword_hits,
+                'indicators': indicator_hits
+            })
+            
+            max_risk = max(max_risk, risk)
+            red_flags.update(matched_keywords)
+            red_flags.update(matched_indicators)
+        
+        # Check for urgency amplifiers (nothing left to amplify once saturated)
+        if not self._urgency_set.isdisjoint(found):
+            if max_risk < 1.0:
+                urgency_hits = len(self._urgency_set.intersection(found))
+                max_risk = min(max_risk + 0.05 * urgency_hits, 1.0)
+            red_flags.add('urgency_pressure')
         
         # Determine threat level
-        if max_risk >= 0.9:
-            threat_level = 'CRITICAL'
-            action = 'DO NOT proceed. This is a scam!'
-            hindi = 'धोखाधड़ी! आगे न बढ़ें!'
-        elif max_risk >= 0.7:
-            threat_level = 'HIGH'
-            action = 'High risk of fraud. Do not accept or pay.'
-            hindi = 'उच्च जोखिम! स्वीकार न करें!'
-        elif max_risk >= 0.4:
-            threat_level = 'MEDIUM'
-            action = 'Exercise caution. Verify before proceeding.'
-            hindi = 'सावधान! पहले जाँच करें.'
-        else:
-            threat_level = 'LOW'
-            action = 'Appears safe, but stay vigilant.'
-            hindi = 'सुरक्षित लगता है.'
+        threat_level = UPI_THREAT_LEVELS[bisect_right(UPI_THREAT_THRESHOLDS, max_risk)]
+        action, hindi = UPI_ADVICE[threat_level]
         
         return {
             'agent': self.agent_id,
             'risk_score': max_risk,
             'threat_level': threat_level,
             'patterns_detected': detected_patterns,
-            'red_flags': list(set(red_flags)),
+            'red_flags': list(red_flags),
             'action': action,
             'hindi': hindi,
-            'matched_trajectories': [
-                t['id'] for t in self.trajectories 
-                if any(rf in t.get('red_flags', []) for rf in red_flags)
-            ]
+            'matched_trajectories': self._match_trajectories(red_flags)
         }
     
+    def _match_trajectories(self, red_flags: Set[str]) -> List[str]:
+        """Ids of trajectories sharing a red flag, in trajectory order"""
+        index = self._trajectory_index
+        positions = set()
+        for flag in red_flags:
+            positions.update(index.get(flag, ()))
+        return [self.trajectories[position]['id'] for position in sorted(positions)]
+    
     def _generate_response(self, task: Task) -> Dict[str, Any]:
         """Override to use pattern matching first, then AI"""
         # First use local pattern matching
-        local_result = self.analyze(task.content)
+        local_result = self.analyze(task.content, features=task.metadata.get('features'))
         
         # If AI available and high risk, enhance with AI
         if self._client and local_result['risk_score'] > 0.5:
             try:
-                from google.genai import types
-                response = self._client.models.generate_content(
-                    model=self.model,
-                    contents=f"Analyze for UPI fraud: {task.content}",
-                    config=types.GenerateContentConfig(
-                        system_instruction=self.system_instruction,
-                        temperature=0.7
-                    )
-                )
+                response = self._client.models.generate_content(**self._ai_request(task))
                 local_result['ai_analysis'] = response.text
             except:
                 pass
         
         return local_result
+    
+    async def _generate_response_async(self, task: Task) -> Dict[str, Any]:
+        """Same as _generate_response, but awaits Gemini on the async client"""
+        # Local matching is cached and fast - only the AI call is awaited
+        local_result = self.analyze(task.content, features=task.metadata.get('features'))
+        
+        if self._client and local_result['risk_score'] > 0.5:
+            try:
+                response = await self._client.aio.models.generate_content(**self._ai_request(task))
+                local_result['ai_analysis'] = response.text
+            except:
+                pass
+        
+        return local_result
+    
+    def _ai_request(self, task: Task) -> Dict[str, Any]:
+        """Arguments for the Gemini enhancement call"""
+        return dict(
+            model=self.model,
+            contents=f"Analyze for UPI fraud: {task.content}",
+            config=self._ai_config(task)
+        )
 
 
 # =============================================================================
 # PHISHING SPECIALIST
 # =============================================================================
 
+# A risk at or above PHISHING_THREAT_THRESHOLDS[i] rates PHISHING_THREAT_LEVELS[i + 1]
+PHISHING_THREAT_THRESHOLDS = (0.7, 0.9)
+PHISHING_THREAT_LEVELS = ('LOW', 'HIGH', 'CRITICAL')
+
+# Hindi warning per threat level
+PHISHING_HINDI = {
+    'CRITICAL': 'गंभीर खतरा! यह फ़िशिंग है! कुछ भी क्लिक न करें!',
+    'HIGH': 'उच्च जोखिम! लिंक पर क्लिक न करें!',
+    'LOW': 'सुरक्षित लगता है.',
+}
+
 class PhishingAgent(BaseAgent):
     """
     Specialist agent for phishing detection
@@ -257,6 +367,37 @@ class PhishingAgent(BaseAgent):
                 'message': 'OTP sharing request - NEVER share!'
             }
         }
+        
+        # One compiled alternation per indicator - any pattern hitting flags it.
+        # Linear-time (RE2) when available: the '.*' patterns run on untrusted text
+        self._indicator_res = {
+            name: compile_linear('|'.join(data['patterns']), re.IGNORECASE)
+            for name, data in self.phishing_indicators.items()
+        }
+        
+        # Every indicator pattern is a literal, optionally followed by '.*' and
+        # more, so a pattern can only match where its leading literal occurs.
+        # The shared keyword scan finds these anchors for all indicators in one
+        # pass; a regex only runs when one of its anchors is present.
+        self._indicator_anchors = {
+            name: [pattern.split('.*')[0].replace('\\', '') for pattern in data['patterns']]
+            for name, data in self.phishing_indicators.items()
+        }
+        
+        # Patterns that are plain literals ('bit\.ly', 'anydesk') are their own
+        # anchor - the scan alone settles them
+        self._indicator_literals = {
+            name: frozenset(
+                literal for literal, whole in map(literal_prefix, data['patterns']) if whole
+            )
+            for name, data in self.phishing_indicators.items()
+        }
+        
+        self.keyword_automaton = KeywordAutomaton({
+            'kyc': ['kyc'],
+            'kyc_action': ['update', 'verify'],
+            **{f'anchor.{name}': anchors for name, anchors in self._indicator_anchors.items()}
+        })
     
     @property
     def system_instruction(self) -> str:
@@ -281,26 +422,44 @@ Response format:
 **Action:** [Clear guidance]
 **हिंदी:** [Hindi warning]"""
     
-    def analyze(self, content: str) -> Dict[str, Any]:
+    @property
+    def trigger_keywords(self) -> List[str]:
+        """Literals one of which must occur in ASCII text for analyze() to find anything"""
+        triggers = ['kyc']
+        for anchors in self._indicator_anchors.values():
+            triggers.extend(anchors)
+        return triggers
+    
+    @cached_analysis()
+    def analyze(self, content: str, features: Optional[MessageFeatures] = None) -> Dict[str, Any]:
         """Analyze for phishing indicators"""
-        content_lower = content.lower()
+        if features is None:
+            features = extract_features(content, self.keyword_automaton)
+        content_lower = features.content_lower
+        found = features.keywords
         
         detected = []
         max_risk = 0.0
         
+        # The anchors are plain literals, but IGNORECASE also matches a few
+        # non-ASCII letters to ASCII ones ('ſ', Kelvin 'K', 'İ', 'ı'), so
+        # non-ASCII text runs every indicator regex
+        prefilter = content_lower.isascii()
+        
         for indicator_name, data in self.phishing_indicators.items():
-            for pattern in data['patterns']:
-                if re.search(pattern, content_lower, re.IGNORECASE):
-                    detected.append({
-                        'indicator': indicator_name,
-                        'risk': data['risk'],
-                        'message': data['message']
-                    })
-                    max_risk = max(max_risk, data['risk'])
-                    break
+            if prefilter and found.isdisjoint(self._indicator_anchors[indicator_name]):
+                continue
+            if (not found.isdisjoint(self._indicator_literals[indicator_name])
+                    or self._indicator_res[indicator_name].search(content_lower)):
+                detected.append({
+                    'indicator': indicator_name,
+                    'risk': data['risk'],
+                    'message': data['message']
+                })
+                max_risk = max(max_risk, data['risk'])
         
         # Additional checks
-        if 'kyc' in content_lower and ('update' in content_lower or 'verify' in content_lower):
+        if 'kyc' in found and ('update' in found or 'verify' in found):
             if max_risk < 0.8:
                 max_risk = 0.85
                 detected.append({
@@ -310,15 +469,8 @@ Response format:
                 })
         
         # Threat level
-        if max_risk >= 0.9:
-            threat_level = 'CRITICAL'
-            hindi = 'गंभीर खतरा! यह फ़िशिंग है! कुछ भी क्लिक न करें!'
-        elif max_risk >= 0.7:
-            threat_level = 'HIGH'
-            hindi = 'उच्च जोखिम! लिंक पर क्लिक न करें!'
-        else:
-            threat_level = 'LOW'
-            hindi = 'सुरक्षित लगता है.'
+        threat_level = PHISHING_THREAT_LEVELS[bisect_right(PHISHING_THREAT_THRESHOLDS, max_risk)]
+        hindi = PHISHING_HINDI[threat_level]
         
         return {
             'agent': self.agent_id,
@@ -330,13 +482,32 @@ Response format:
         }
     
     def _generate_response(self, task: Task) -> Dict[str, Any]:
-        return self.analyze(task.content)
+        return self.analyze(task.content, features=task.metadata.get('features'))
 
 
 # =============================================================================
 # IMPERSONATION SPECIALIST
 # =============================================================================
 
+# Video call / digital arrest terms
+DIGITAL_ARREST_TERMS = ('video call', 'whatsapp video', 'online arrest', 'digital arrest')
+DIGITAL_ARREST_SET = frozenset(DIGITAL_ARREST_TERMS)
+
+# A risk at or above IMPERSONATION_THREAT_THRESHOLDS[i] rates IMPERSONATION_THREAT_LEVELS[i + 1]
+IMPERSONATION_THREAT_THRESHOLDS = (0.5, 0.8)
+IMPERSONATION_THREAT_LEVELS = ('LOW', 'HIGH', 'CRITICAL')
+
+# (action, hindi) advice per threat level
+IMPERSONATION_ADVICE = {
+    'CRITICAL': (
+        'HANG UP IMMEDIATELY! This is impersonation fraud.',
+        '🚨 तुरंत फोन काटें! यह नकली पुलिस है! असली पुलिस फोन पर पैसे नहीं मांगती! हेल्पलाइन: 1930'
+    ),
+    'HIGH': ('Likely impersonation. Do not share any info or money.', 'संभावित धोखाधड़ी। कोई जानकारी या पैसे न दें।'),
+    'LOW': ('Low risk detected.', 'कम जोखिम।'),
+}
+
+
 class ImpersonationAgent(BaseAgent):
     """
     Specialist agent for authority impersonation detection
@@ -371,6 +542,24 @@ class ImpersonationAgent(BaseAgent):
             'pay', 'transfer', 'fine', 'penalty', 'fee', 'deposit',
             'security', 'bail', '₹', 'rs', 'rupee', 'lakh', 'crore'
         ]
+        
+        # Abbreviations short enough to occur inside ordinary words
+        # ('linked' has 'ed', 'hours' has 'rs', 'first' has 'fir');
+        # these only count as standalone words. 'rs' is commonly written
+        # against the amount ('Rs5000', '5000rs'), so only letters bound it
+        word_terms = ['ed', 'cbi', 'ncb', 'fir']
+        self.whole_word_terms = word_terms + ['rs']
+        self._whole_word_re = compile_re(
+            r'(?<!\w)(?:' + '|'.join(map(re.escape, word_terms)) + r')(?!\w)'
+            r'|(?<![a-z])rs(?![a-z])'
+        )
+        
+        self.keyword_automaton = KeywordAutomaton({
+            'authority': self.authority_keywords,
+            'threat': self.threat_indicators,
+            'money': self.money_demands,
+            'digital_arrest': DIGITAL_ARREST_TERMS
+        })
     
     @property
     def system_instruction(self) -> str:
@@ -403,13 +592,26 @@ Response format:
 **Action:** HANG UP IMMEDIATELY. Call 1930.
 **हिंदी:** [Hindi warning]"""
     
-    def analyze(self, content: str) -> Dict[str, Any]:
+    @property
+    def trigger_keywords(self) -> List[str]:
+        """Literals at least one of which must occur for analyze() to find anything"""
+        return list(self.keyword_automaton.keywords)
+    
+    @cached_analysis()
+    def analyze(self, content: str, features: Optional[MessageFeatures] = None) -> Dict[str, Any]:
         """Analyze for impersonation"""
-        content_lower = content.lower()
+        if features is None:
+            features = extract_features(content, self.keyword_automaton)
+        found = features.keywords
+        
+        # The keyword scan finds substrings; confirm abbreviations stand alone
+        if not found.isdisjoint(self.whole_word_terms):
+            standalone = set(self._whole_word_re.findall(features.content_lower))
+            found = found.difference(t for t in self.whole_word_terms if t not in standalone)
         
-        authority_hits = [kw for kw in self.authority_keywords if kw in content_lower]
-        threat_hits = [t for t in self.threat_indicators if t in content_lower]
-        money_hits = [m for m in self.money_demands if m in content_lower]
+        authority_hits = [kw for kw in self.authority_keywords if kw in found]
+        threat_hits = [t for t in self.threat_indicators if t in found]
+        money_hits = [m for m in self.money_demands if m in found]
         
         risk_score = 0.0
         
@@ -423,23 +625,13 @@ Response format:
             risk_score += 0.35
         
         # Video call / digital arrest indicator
-        if any(term in content_lower for term in ['video call', 'whatsapp video', 'online arrest', 'digital arrest']):
+        if not DIGITAL_ARREST_SET.isdisjoint(found):
             risk_score += 0.25
         
         risk_score = min(risk_score, 1.0)
         
-        if risk_score >= 0.8:
-            threat_level = 'CRITICAL'
-            action = 'HANG UP IMMEDIATELY! This is impersonation fraud.'
-            hindi = '🚨 तुरंत फोन काटें! यह नकली पुलिस है! असली पुलिस फोन पर पैसे नहीं मांगती! हेल्पलाइन: 1930'
-        elif risk_score >= 0.5:
-            threat_level = 'HIGH'
-            action = 'Likely impersonation. Do not share any info or money.'
-            hindi = 'संभावित धोखाधड़ी। कोई जानकारी या पैसे न दें।'
-        else:
-            threat_level = 'LOW'
-            action = 'Low risk detected.'
-            hindi = 'कम जोखिम।'
+        threat_level = IMPERSONATION_THREAT_LEVELS[bisect_right(IMPERSONATION_THREAT_THRESHOLDS, risk_score)]
+        action, hindi = IMPERSONATION_ADVICE[threat_level]
         
         return {
             'agent': self.agent_id,
@@ -455,13 +647,17 @@ Response format:
         }
     
     def _generate_response(self, task: Task) -> Dict[str, Any]:
-        return self.analyze(task.content)
+        return self.analyze(task.content, features=task.metadata.get('features'))
 
 
 # =============================================================================
 # DOCUMENT SPECIALIST
 # =============================================================================
 
+# Quoted interest rate, e.g. "18.5% p.a."
+INTEREST_RATE_RE = compile_re(r'(\d+\.?\d*)\s*%\s*(p\.?a\.?|per\s*annum)?')
+
+
 class DocumentAnalystAgent(BaseAgent):
     """
     Specialist agent for financial document analysis
@@ -495,6 +691,28 @@ class DocumentAnalystAgent(BaseAgent):
             'co_payment': ['co-pay', 'co-insurance', 'borne by insured'],
             'exclusions': ['not covered', 'excluded', 'exception', 'does not cover']
         }
+        
+        # Per document type: (issue title, [(lowercased keyword, keyword, risk)])
+        # - everything analyze() reports for a keyword, worked out once
+        self._issue_table = {
+            doc_type: [
+                (
+                    issue_name.replace('_', ' ').title(),
+                    [
+                        (kw.lower(), kw, 'HIGH' if 'penalty' in kw or 'not covered' in kw else 'MEDIUM')
+                        for kw in keywords
+                    ]
+                )
+                for issue_name, keywords in flags.items()
+            ]
+            for doc_type, flags in (('loan', self.loan_red_flags), ('insurance', self.insurance_red_flags))
+        }
+        
+        self.keyword_automaton = KeywordAutomaton({
+            f'{doc_type}.{issue_name}': [kw.lower() for kw in keywords]
+            for doc_type, flags in (('loan', self.loan_red_flags), ('insurance', self.insurance_red_flags))
+            for issue_name, keywords in flags.items()
+        })
     
     @property
     def system_instruction(self) -> str:
@@ -514,25 +732,29 @@ Analyze documents for:
 Provide simple explanations for non-experts.
 Always highlight terms user should negotiate or question."""
     
-    def analyze(self, content: str, doc_type: str = 'loan') -> Dict[str, Any]:
+    @cached_analysis(digest_text=True)
+    def analyze(
+        self,
+        content: str,
+        doc_type: str = 'loan',
+        features: Optional[MessageFeatures] = None
+    ) -> Dict[str, Any]:
         """Analyze document for hidden risks"""
-        content_lower = content.lower()
+        if features is None:
+            features = extract_features(content, self.keyword_automaton)
+        content_lower = features.content_lower
+        found = features.keywords
         
-        red_flags = self.loan_red_flags if doc_type == 'loan' else self.insurance_red_flags
         found_issues = []
         
-        for issue_name, keywords in red_flags.items():
-            for kw in keywords:
-                if kw.lower() in content_lower:
-                    found_issues.append({
-                        'issue': issue_name.replace('_', ' ').title(),
-                        'keyword': kw,
-                        'risk': 'HIGH' if 'penalty' in kw or 'not covered' in kw else 'MEDIUM'
-                    })
+        for issue, keywords in self._issue_table['loan' if doc_type == 'loan' else 'insurance']:
+            for kw_lower, kw, risk in keywords:
+                if kw_lower in found:
+                    found_issues.append({'issue': issue, 'keyword': kw, 'risk': risk})
                     break
         
-        # Extract interest rate if present
-        rate_match = re.search(r'(\d+\.?\d*)\s*%\s*(p\.?a\.?|per\s*annum)?', content_lower)
+        # Extract interest rate if present (a rate needs a '%' - memchr first)
+        rate_match = INTEREST_RATE_RE.search(content_lower) if '%' in content_lower else None
         interest_rate = float(rate_match.group(1)) if rate_match else None
         
         if interest_rate and interest_rate > 15:
@@ -557,13 +779,28 @@ Always highlight terms user should negotiate or question."""
     
     def _generate_response(self, task: Task) -> Dict[str, Any]:
         doc_type = task.metadata.get('document_type', 'loan')
-        return self.analyze(task.content, doc_type)
+        return self.analyze(task.content, doc_type, features=task.metadata.get('features'))
 
 
 # =============================================================================
 # INVESTMENT FRAUD SPECIALIST
 # =============================================================================
 
+# Unrealistic periodic return claims, e.g. "5% daily"
+RETURN_CLAIM_RE = compile_re(r'(\d+)\s*%\s*(daily|weekly|monthly|per month)')
+
+# A risk at or above INVESTMENT_THREAT_THRESHOLDS[i] rates INVESTMENT_THREAT_LEVELS[i + 1]
+INVESTMENT_THREAT_THRESHOLDS = (0.5, 0.8)
+INVESTMENT_THREAT_LEVELS = ('LOW', 'HIGH', 'CRITICAL')
+
+# Hindi warning per threat level
+INVESTMENT_HINDI = {
+    'CRITICAL': '🚨 यह निवेश धोखाधड़ी है! पैसे न लगाएं!',
+    'HIGH': 'संभावित धोखाधड़ी। SEBI पंजीकरण जांचें।',
+    'LOW': 'सामान्य जोखिम।',
+}
+
+
 class InvestmentFraudAgent(BaseAgent):
     """
     Specialist agent for investment fraud detection
@@ -594,6 +831,11 @@ class InvestmentFraudAgent(BaseAgent):
             'joining fee', 'registration fee', 'crypto trading',
             'forex', 'binary options', 'daily profit'
         ]
+        
+        self.keyword_automaton = KeywordAutomaton({
+            'scam': self.scam_indicators,
+            'red_flag': self.red_flag_terms
+        })
     
     @property
     def system_instruction(self) -> str:
@@ -613,12 +855,16 @@ Key rules for users:
 
 Always warn about unrealistic promises."""
     
-    def analyze(self, content: str) -> Dict[str, Any]:
+    @cached_analysis()
+    def analyze(self, content: str, features: Optional[MessageFeatures] = None) -> Dict[str, Any]:
         """Analyze for investment scams"""
-        content_lower = content.lower()
+        if features is None:
+            features = extract_features(content, self.keyword_automaton)
+        content_lower = features.content_lower
+        found = features.keywords
         
-        scam_hits = [s for s in self.scam_indicators if s in content_lower]
-        red_flag_hits = [r for r in self.red_flag_terms if r in content_lower]
+        scam_hits = [s for s in self.scam_indicators if s in found]
+        red_flag_hits = [r for r in self.red_flag_terms if r in found]
         
         risk_score = 0.0
         if scam_hits:
@@ -627,21 +873,14 @@ Always warn about unrealistic promises."""
             risk_score += 0.3 * min(len(red_flag_hits), 3)
         
         # Check for unrealistic return claims
-        return_match = re.search(r'(\d+)\s*%\s*(daily|weekly|monthly|per month)', content_lower)
+        return_match = RETURN_CLAIM_RE.search(content_lower) if '%' in content_lower else None
         if return_match:
             risk_score = max(risk_score, 0.95)
         
         risk_score = min(risk_score, 1.0)
         
-        if risk_score >= 0.8:
-            threat_level = 'CRITICAL'
-            hindi = '🚨 यह निवेश धोखाधड़ी है! पैसे न लगाएं!'
-        elif risk_score >= 0.5:
-            threat_level = 'HIGH'
-            hindi = 'संभावित धोखाधड़ी। SEBI पंजीकरण जांचें।'
-        else:
-            threat_level = 'LOW'
-            hindi = 'सामान्य जोखिम।'
+        threat_level = INVESTMENT_THREAT_LEVELS[bisect_right(INVESTMENT_THREAT_THRESHOLDS, risk_score)]
+        hindi = INVESTMENT_HINDI[threat_level]
         
         return {
             'agent': self.agent_id,
@@ -655,7 +894,7 @@ Always warn about unrealistic promises."""
         }
     
     def _generate_response(self, task: Task) -> Dict[str, Any]:
-        return self.analyze(task.content)
+        return self.analyze(task.content, features=task.metadata.get('features'))
 
 
 # =============================================================================
@@ -663,6 +902,9 @@ Always warn about unrealistic promises."""
 # =============================================================================
 
 __all__ = [
+    'MessageFeatures',
+    'extract_features',
+    'extract_features_many',
     'UPIFraudAgent',
     'PhishingAgent',
     'ImpersonationAgent',
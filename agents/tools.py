@@ -6,9 +6,15 @@ Specialized tools that agents can use for fraud detection and document analysis
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
-import re
+from functools import lru_cache
 import json
 
+from core.keyword_automaton import KeywordAutomaton, PatternMatcher
+from core.analysis_cache import cached_analysis
+from core.regex_cache import compile_re, compile_linear
+from core.lazy import lazy_class_attribute
+from agents.specialists import MessageFeatures
+
 
 class RiskLevel(Enum):
     SAFE = "safe"
@@ -18,7 +24,7 @@ class RiskLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Standard result from any tool"""
     success: bool
@@ -30,6 +36,23 @@ class ToolResult:
     hindi_explanation: Optional[str] = None
 
 
+# Texts up to this long share lowercased copies across detectors; longer
+# documents are not kept alive by the cache
+LOWER_CACHE_LIMIT = 4096
+
+
+@lru_cache(maxsize=1024)
+def _lower(text: str) -> str:
+    return text.lower()
+
+
+def _lowercase(text: str, features: Optional[MessageFeatures]) -> str:
+    """text lowercased, reusing the copy in features when the caller has one"""
+    if features is not None:
+        return features.content_lower
+    return _lower(text) if len(text) <= LOWER_CACHE_LIMIT else text.lower()
+
+
 # =============================================================================
 # TOOL 1: UPI Scam Detector
 # =============================================================================
@@ -71,20 +94,39 @@ class UPIScamDetector:
         }
     }
     
+    URGENCY_WORDS = ["urgent", "immediately", "now", "hurry", "fast", "quick", "limited", "expire"]
+    
+    @lazy_class_attribute
+    def KEYWORDS(cls) -> KeywordAutomaton:
+        """Every keyword above, matched in one pass per message"""
+        return KeywordAutomaton(dict(
+            [
+                (f"{name}.{part}", data[part])
+                for name, data in cls.SCAM_PATTERNS.items()
+                for part in ("keywords", "indicators")
+            ] + [("urgency", cls.URGENCY_WORDS)]
+        ))
+    
     # Suspicious amount patterns
-    ODD_AMOUNTS = [1, 10, 49999, 50000, 99999, 100000]
+    ODD_AMOUNTS = frozenset({1, 10, 49999, 50000, 99999, 100000})
     
-    def analyze(self, message: str, amount: Optional[float] = None) -> ToolResult:
+    @cached_analysis()
+    def analyze(
+        self,
+        message: str,
+        amount: Optional[float] = None,
+        features: Optional[MessageFeatures] = None
+    ) -> ToolResult:
         """Analyze a UPI-related message for scam indicators"""
-        message_lower = message.lower()
+        hits = self.KEYWORDS.scan(_lowercase(message, features))
         
         detected_patterns = []
         total_risk = 0.0
         evidence = []
         
         for pattern_name, pattern_data in self.SCAM_PATTERNS.items():
-            keyword_matches = sum(1 for kw in pattern_data["keywords"] if kw in message_lower)
-            indicator_matches = sum(1 for ind in pattern_data["indicators"] if ind in message_lower)
+            keyword_matches = len(hits[f"{pattern_name}.keywords"])
+            indicator_matches = len(hits[f"{pattern_name}.indicators"])
             
             if keyword_matches > 0 and indicator_matches > 0:
                 pattern_risk = pattern_data["risk"] * (0.5 + 0.25 * keyword_matches + 0.25 * indicator_matches)
@@ -99,8 +141,7 @@ class UPIScamDetector:
                 evidence.append(f"Matched pattern: {pattern_name}")
         
         # Check for urgency language
-        urgency_words = ["urgent", "immediately", "now", "hurry", "fast", "quick", "limited", "expire"]
-        urgency_count = sum(1 for word in urgency_words if word in message_lower)
+        urgency_count = len(hits["urgency"])
         if urgency_count > 0:
             total_risk = min(total_risk + 0.1 * urgency_count, 1.0)
             evidence.append(f"Urgency language detected ({urgency_count} indicators)")
@@ -187,28 +228,39 @@ class KYCPhishingDetector:
         }
     }
     
-    def analyze(self, message: str) -> ToolResult:
+    @lazy_class_attribute
+    def INDICATOR_PATTERNS(cls) -> PatternMatcher:
+        """All indicators decided in one keyword scan plus the few regexes it can't settle"""
+        return PatternMatcher({
+            name: data["patterns"] for name, data in cls.PHISHING_INDICATORS.items()
+        })
+    
+    CREDENTIAL_RE = compile_re(r"otp|pin|password|cvv")
+    
+    # Finding reported per indicator, built once - each caller gets a copy
+    INDICATOR_FINDINGS = {
+        name: {"indicator": name, "risk": data["risk"], "explanation": data["explanation"]}
+        for name, data in PHISHING_INDICATORS.items()
+    }
+    
+    @cached_analysis()
+    def analyze(self, message: str, features: Optional[MessageFeatures] = None) -> ToolResult:
         """Analyze message for KYC phishing indicators"""
-        message_lower = message.lower()
+        message_lower = _lowercase(message, features)
         
         detected = []
         max_risk = 0.0
         evidence = []
         
+        matched = self.INDICATOR_PATTERNS.matching(message_lower)
         for indicator_name, data in self.PHISHING_INDICATORS.items():
-            for pattern in data["patterns"]:
-                if re.search(pattern, message_lower):
-                    detected.append({
-                        "indicator": indicator_name,
-                        "risk": data["risk"],
-                        "explanation": data["explanation"]
-                    })
-                    max_risk = max(max_risk, data["risk"])
-                    evidence.append(data["explanation"])
-                    break
+            if indicator_name in matched:
+                detected.append(self.INDICATOR_FINDINGS[indicator_name])
+                max_risk = max(max_risk, data["risk"])
+                evidence.append(data["explanation"])
         
         # Check for OTP/PIN requests
-        if re.search(r"otp|pin|password|cvv", message_lower):
+        if self.CREDENTIAL_RE.search(message_lower):
             max_risk = max(max_risk, 0.95)
             evidence.append("Request for sensitive credentials (OTP/PIN/CVV)")
         
@@ -270,12 +322,28 @@ class PoliceImpersonationDetector:
         "aadhaar", "pan", "bank account"
     ]
     
-    def analyze(self, message: str) -> ToolResult:
+    # Literal alternatives of the money-demand and time-pressure checks
+    # ("rs" covers the old optional-dot "rs\.?")
+    MONEY_TERMS = ["pay", "transfer", "₹", "rs", "rupee", "fine", "penalty", "fee"]
+    PRESSURE_TERMS = ["immediate", "now", "today", "urgent"]
+    
+    @lazy_class_attribute
+    def KEYWORDS(cls) -> KeywordAutomaton:
+        """Authority, threat, money and pressure terms, matched in one pass"""
+        return KeywordAutomaton({
+            "authority": cls.AUTHORITY_KEYWORDS,
+            "threat": cls.THREAT_PATTERNS,
+            "money": cls.MONEY_TERMS,
+            "pressure": cls.PRESSURE_TERMS
+        })
+    
+    @cached_analysis()
+    def analyze(self, message: str, features: Optional[MessageFeatures] = None) -> ToolResult:
         """Analyze for police impersonation scam"""
-        message_lower = message.lower()
+        hits = self.KEYWORDS.scan(_lowercase(message, features))
         
-        authority_matches = [kw for kw in self.AUTHORITY_KEYWORDS if kw in message_lower]
-        threat_matches = [pt for pt in self.THREAT_PATTERNS if pt in message_lower]
+        authority_matches = hits["authority"]
+        threat_matches = hits["threat"]
         
         # Calculate risk based on combination
         risk_score = 0.0
@@ -290,12 +358,12 @@ class PoliceImpersonationDetector:
             evidence.append(f"Threat language: {', '.join(threat_matches[:3])}")
         
         # Money demand is critical indicator
-        if re.search(r"pay|transfer|₹|rs\.?|rupee|fine|penalty|fee", message_lower):
+        if hits["money"]:
             risk_score += 0.35
             evidence.append("Monetary demand detected")
         
         # Time pressure
-        if re.search(r"immediate|now|today|urgent", message_lower):
+        if hits["pressure"]:
             risk_score += 0.15
             evidence.append("Immediate action demanded")
         
@@ -335,6 +403,10 @@ class PoliceImpersonationDetector:
 # TOOL 4: Loan Agreement Decoder
 # =============================================================================
 
+# Document risk labels, indexed by rank
+RISK_RANKS = ("LOW", "MEDIUM", "HIGH")
+
+
 class LoanAgreementDecoder:
     """
     Tool for decoding complex loan and EMI agreements
@@ -378,32 +450,68 @@ class LoanAgreementDecoder:
         }
     }
     
-    def analyze(self, document_text: str) -> ToolResult:
+    @lazy_class_attribute
+    def TERM_PATTERNS(cls) -> PatternMatcher:
+        """All danger terms decided in one keyword scan plus the few regexes it can't settle"""
+        return PatternMatcher({
+            name: data["patterns"] for name, data in cls.DANGER_TERMS.items()
+        })
+    
+    # Extraction regexes run over whole documents - linear-time engine when available
+    RATE_RE = compile_linear(r"(\d+\.?\d*)\s*%\s*(p\.?a\.?|per\s*annum|annual)")
+    
+    # Finding reported per danger term, built once - each caller gets a copy
+    TERM_FINDINGS = {
+        name: {
+            "term": name.replace("_", " ").title(),
+            "risk": data["risk"],
+            "explanation": data["explanation"]
+        }
+        for name, data in DANGER_TERMS.items()
+    }
+    
+    # Term risks as ranks, so the worst one is an integer max
+    TERM_RANKS = {name: RISK_RANKS.index(data["risk"]) for name, data in DANGER_TERMS.items()}
+    
+    def _clean_result(self) -> ToolResult:
+        """Result for a document with no danger terms and no stated rate"""
+        return ToolResult(
+            success=True,
+            tool_name=self.NAME,
+            result={
+                "found_terms": [],
+                "risk_summary": {"HIGH": 0, "MEDIUM": 0, "LOW": 0},
+                "interest_rate": None,
+                "max_risk": "LOW"
+            },
+            risk_level=RiskLevel.LOW,
+            confidence=0.75,
+            explanation="Document appears standard. Still recommended to read fully.",
+            hindi_explanation="दस्तावेज़ सामान्य लगता है। फिर भी पूरा पढ़ने की सलाह है।"
+        )
+    
+    # Documents can be large - keyed by digest rather than held by value
+    @cached_analysis(digest_text=True)
+    def analyze(self, document_text: str, features: Optional[MessageFeatures] = None) -> ToolResult:
         """Analyze loan document for hidden terms"""
-        text_lower = document_text.lower()
+        text_lower = _lowercase(document_text, features)
         
         found_terms = []
-        max_risk = "LOW"
-        total_risks = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
-        
-        for term_name, data in self.DANGER_TERMS.items():
-            for pattern in data["patterns"]:
-                if re.search(pattern, text_lower):
-                    found_terms.append({
-                        "term": term_name.replace("_", " ").title(),
-                        "risk": data["risk"],
-                        "explanation": data["explanation"]
-                    })
-                    total_risks[data["risk"]] += 1
-                    if data["risk"] == "HIGH":
-                        max_risk = "HIGH"
-                    elif data["risk"] == "MEDIUM" and max_risk != "HIGH":
-                        max_risk = "MEDIUM"
-                    break
+        max_rank = 0
+        rank_counts = [0, 0, 0]
+        
+        matched = self.TERM_PATTERNS.matching(text_lower)
+        for term_name, rank in self.TERM_RANKS.items():
+            if term_name in matched:
+                found_terms.append(self.TERM_FINDINGS[term_name])
+                rank_counts[rank] += 1
+                max_rank = max(max_rank, rank)
         
         # Extract interest rate if mentioned
-        rate_match = re.search(r"(\d+\.?\d*)\s*%\s*(p\.?a\.?|per\s*annum|annual)", text_lower)
+        rate_match = self.RATE_RE.search(text_lower) if '%' in text_lower else None
         interest_rate = float(rate_match.group(1)) if rate_match else None
+        if not found_terms and interest_rate is None:
+            return self._clean_result()
         
         # Calculate effective annual rate warning
         if interest_rate and interest_rate > 15:
@@ -412,7 +520,10 @@ class LoanAgreementDecoder:
                 "risk": "HIGH",
                 "explanation": f"Interest rate of {interest_rate}% is above market average"
             })
-            max_risk = "HIGH"
+            max_rank = 2
+        
+        max_risk = RISK_RANKS[max_rank]
+        total_risks = {"HIGH": rank_counts[2], "MEDIUM": rank_counts[1], "LOW": rank_counts[0]}
         
         # Generate summary
         if max_risk == "HIGH":
@@ -484,24 +595,54 @@ class InsurancePolicyDecoder:
         }
     }
     
-    def analyze(self, policy_text: str) -> ToolResult:
+    @lazy_class_attribute
+    def EXCLUSION_PATTERNS(cls) -> PatternMatcher:
+        """All exclusions decided in one keyword scan plus the few regexes it can't settle"""
+        return PatternMatcher({
+            name: data["patterns"] for name, data in cls.CRITICAL_EXCLUSIONS.items()
+        })
+    
+    WAITING_PERIOD_RE = compile_linear(r"(\d+)\s*(days?|months?|years?).*waiting")
+    
+    # Finding reported per exclusion, built once - each caller gets a copy
+    EXCLUSION_FINDINGS = {
+        name: {"type": name.replace("_", " ").title(), "explanation": data["explanation"]}
+        for name, data in CRITICAL_EXCLUSIONS.items()
+    }
+    
+    def _clean_result(self) -> ToolResult:
+        """Result for a policy with no exclusions and no waiting period"""
+        return ToolResult(
+            success=True,
+            tool_name=self.NAME,
+            result={
+                "exclusions": [],
+                "waiting_period": None,
+                "exclusion_count": 0
+            },
+            risk_level=RiskLevel.LOW,
+            confidence=0.7,
+            explanation="No major exclusions detected in analyzed text.",
+            hindi_explanation="कोई बड़ी सीमाएं नहीं मिलीं।"
+        )
+    
+    @cached_analysis(digest_text=True)
+    def analyze(self, policy_text: str, features: Optional[MessageFeatures] = None) -> ToolResult:
         """Analyze insurance policy for exclusions and limitations"""
-        text_lower = policy_text.lower()
+        text_lower = _lowercase(policy_text, features)
         
         exclusions_found = []
         
-        for exclusion_name, data in self.CRITICAL_EXCLUSIONS.items():
-            for pattern in data["patterns"]:
-                if re.search(pattern, text_lower):
-                    exclusions_found.append({
-                        "type": exclusion_name.replace("_", " ").title(),
-                        "explanation": data["explanation"]
-                    })
-                    break
+        matched = self.EXCLUSION_PATTERNS.matching(text_lower)
+        for exclusion_name, finding in self.EXCLUSION_FINDINGS.items():
+            if exclusion_name in matched:
+                exclusions_found.append(finding)
         
         # Extract waiting period if mentioned
-        waiting_match = re.search(r"(\d+)\s*(days?|months?|years?).*waiting", text_lower)
+        waiting_match = self.WAITING_PERIOD_RE.search(text_lower)
         waiting_period = f"{waiting_match.group(1)} {waiting_match.group(2)}" if waiting_match else None
+        if not exclusions_found and waiting_period is None:
+            return self._clean_result()
         
         # Generate analysis
         if len(exclusions_found) >= 3:
@@ -0,0 +1,59 @@
+"""
+Scalar API - Request Batching
+Coalesces concurrent analyze requests into analyze_many() calls
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Analyze requests arriving within this many seconds share one batch
+COALESCE_WINDOW = 0.005
+
+
+class AnalysisBatcher:
+    """
+    Coalesces concurrent analyze requests into analyze_many() calls
+    
+    The first request of a batch schedules a flush `window` seconds later;
+    every request arriving before then joins it. analyze_many takes one age
+    per call, so a batch is split by age, and each part runs off the event
+    loop in a worker thread.
+    """
+    
+    def __init__(self, analyze_many: Callable[[List[str], int], List[Any]], window: float = COALESCE_WINDOW):
+        self.analyze_many = analyze_many
+        self.window = window
+        self._pending: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def analyze(self, message: str, user_age: int = 45) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, user_age, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+    
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, []
+        self._flush_task = None
+        
+        # analyze_many takes one age per batch
+        by_age: Dict[int, List[Tuple[str, asyncio.Future]]] = {}
+        for message, user_age, future in pending:
+            by_age.setdefault(user_age, []).append((message, future))
+        
+        for user_age, requests in by_age.items():
+            try:
+                results = await asyncio.to_thread(
+                    self.analyze_many, [message for message, _ in requests], user_age
+                )
+            except Exception as e:
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(requests, results):
+                # A disconnected client's request may have been cancelled
+                if not future.done():
+                    future.set_result(result)
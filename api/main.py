@@ -4,6 +4,8 @@ Scalar API - Financial Bodyguard Multi-Agent Service
 
 import os
 import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from dataclasses import asdict
@@ -15,11 +17,12 @@ from pydantic import BaseModel
 import sys
 sys.path.insert(0, '/app')
 
-from antigravity.agents.financial_bodyguard import get_bodyguard, analyze
+from antigravity.agents.financial_bodyguard import get_bodyguard, analyze, analyze_many, ProtectionResult
 from antigravity.agents.specialists import (
     UPIFraudAgent, PhishingAgent, ImpersonationAgent,
     DocumentAnalystAgent, InvestmentFraudAgent
 )
+from .batching import AnalysisBatcher
 
 app = FastAPI(
     title="Scalar - Financial Bodyguard API",
@@ -37,6 +40,18 @@ app.add_middleware(
 
 connections: List[WebSocket] = []
 
+# WebSocket analyze requests are coalesced into analyze_many() batches
+batcher = AnalysisBatcher(analyze_many)
+
+
+@app.on_event("startup")
+async def configure_executor():
+    # Analyses run off the event loop (asyncio.to_thread) in this pool
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4),
+        thread_name_prefix="analysis"
+    ))
+
 
 class AnalyzeRequest(BaseModel):
     message: str
@@ -102,7 +117,7 @@ async def get_trajectories():
 @app.post("/analyze")
 async def analyze_message(request: AnalyzeRequest):
     """Analyze message using multi-agent system"""
-    result = analyze(request.message, request.user_age)
+    result = await asyncio.to_thread(analyze, request.message, request.user_age)
     
     # Broadcast to WebSocket
     await broadcast({
@@ -129,7 +144,7 @@ async def analyze_message(request: AnalyzeRequest):
 @app.post("/analyze/quick")
 async def quick_analyze(message: str, user_age: int = 45):
     """Quick analysis endpoint"""
-    result = analyze(message, user_age)
+    result = await asyncio.to_thread(analyze, message, user_age)
     return {
         "threat_level": result.threat_level,
         "risk_score": result.risk_score,
@@ -142,8 +157,9 @@ async def quick_analyze(message: str, user_age: int = 45):
 @app.post("/analyze/document")
 async def analyze_document(request: DocumentRequest):
     """Analyze loan or insurance document"""
-    doc_agent = DocumentAnalystAgent()
-    result = doc_agent.analyze(request.document_text, request.document_type)
+    # Documents can be large - keep the scan off the event loop
+    doc_agent = get_bodyguard().specialists['document']
+    result = await asyncio.to_thread(doc_agent.analyze, request.document_text, request.document_type)
     return {
         "success": True,
         "document_type": request.document_type,
@@ -160,7 +176,7 @@ async def use_specific_agent(agent_id: str, message: str):
     if not agent:
         raise HTTPException(404, f"Agent {agent_id} not found")
     
-    result = agent.analyze(message)
+    result = await asyncio.to_thread(agent.analyze, message)
     return {
         "agent": agent_id,
         "agent_name": agent.name,
@@ -187,7 +203,7 @@ async def websocket_endpoint(websocket: WebSocket):
             msg = json.loads(data)
             
             if msg.get("type") == "analyze":
-                result = analyze(
+                result = await batcher.analyze(
                     msg.get("message", ""),
                     msg.get("user_age", 45)
                 )
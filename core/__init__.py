@@ -1,3 +1,7 @@
 """Scalar Core Module"""
-from .adk_core import BaseAgent, MultiAgentOrchestrator, AgentRole, Task, TaskResult
+from .adk_core import BaseAgent, MultiAgentOrchestrator, AgentRole, Task, TaskResult, ResponseBudget
 from .gemini_client import get_gemini_client, GeminiClient
+from .keyword_automaton import KeywordAutomaton, PatternMatcher
+from .analysis_cache import cached_analysis, LRUCache
+from .regex_cache import compile_re, compile_linear
+from .lazy import lazy_class_attribute
@@ -9,28 +9,21 @@ This module implements:
 - Tool function definitions
 """
 
-import os
 import json
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Callable, Union
-from dataclasses import dataclass, field
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Union, Deque
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
 import time
 
 # Load environment
 from dotenv import load_dotenv
 load_dotenv()
 
-try:
-    from google import genai
-    from google.genai import types
-    GENAI_AVAILABLE = True
-except ImportError:
-    GENAI_AVAILABLE = False
-    genai = None
-    types = None
+from .gemini_client import get_gemini_client, genai_modules
 
 
 # =============================================================================
@@ -54,7 +47,14 @@ class TaskStatus(Enum):
     DELEGATED = "delegated"
 
 
-@dataclass
+class ResponseBudget(Enum):
+    """Cap on the tokens a model may generate for a task"""
+    SHORT = 256     # Verdicts and one-line labels
+    MEDIUM = 512    # Short explanations
+    LONG = 1024     # Free-form answers
+
+
+@dataclass(slots=True)
 class AgentContext:
     """Shared context across agents"""
     session_id: str
@@ -65,7 +65,7 @@ class AgentContext:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Task to be executed by an agent"""
     task_id: str
@@ -76,9 +76,10 @@ class Task:
     parent_task_id: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: float = field(default_factory=time.time)
+    response_budget: ResponseBudget = ResponseBudget.LONG
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Result from agent task execution"""
     task_id: str
@@ -89,14 +90,35 @@ class TaskResult:
     reasoning: str
     sub_results: List['TaskResult'] = field(default_factory=list)
     execution_time: float = 0.0
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Rarely set - None until a producer has something to attach
+    metadata: Optional[Dict[str, Any]] = None
+
+
+# (epoch second, ISO prefix) of the last timestamp issued
+_timestamp_second = (None, "")
+
+
+def utc_timestamp() -> str:
+    """
+    Current UTC time as an ISO 8601 string
+    
+    Same output as datetime.utcnow().isoformat(), but the date/time part is
+    formatted once per second and only the microseconds are appended per call.
+    """
+    global _timestamp_second
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _timestamp_second
+    if cached_second != seconds:
+        prefix = datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None).isoformat()
+        _timestamp_second = (seconds, prefix)
+    return f"{prefix}.{micros:06d}" if micros else prefix
 
 
 # =============================================================================
 # TOOL DEFINITIONS (ADK Compatible)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     """ADK-compatible tool definition"""
     name: str
@@ -179,12 +201,10 @@ class BaseAgent(ABC):
         self.task_history: List[TaskResult] = []
         self.sub_agents: Dict[str, 'BaseAgent'] = {}
         
-        # Gemini client
-        self._client = None
-        if GENAI_AVAILABLE:
-            api_key = os.getenv('GEMINI_API_KEY')
-            if api_key:
-                self._client = genai.Client(api_key=api_key)
+        # Gemini client - one per process, shared by all agents
+        self._client = get_gemini_client().client
+        # Request configs by response budget, built on first use
+        self._ai_configs: Dict[ResponseBudget, Any] = {}
     
     @property
     @abstractmethod
@@ -228,44 +248,71 @@ class BaseAgent(ABC):
                 # Direct response
                 result = self._generate_response(task)
             
-            # Step 3: Verify result
-            verified_result = self._verify(task, result)
+            return self._complete(task, plan, result, start_time)
             
-            execution_time = time.time() - start_time
+        except Exception as e:
+            return self._failed(task, e, start_time)
+    
+    async def execute_async(self, task: Task) -> TaskResult:
+        """
+        Async version of execute
+        
+        Model calls and delegation are awaited natively, so concurrent tasks
+        overlap their network waits on the event loop without holding
+        executor threads. Tools are plain sync functions and still run in the
+        default executor.
+        """
+        start_time = time.time()
+        
+        try:
+            plan = self._plan(task)
             
-            task_result = TaskResult(
-                task_id=task.task_id,
-                agent_id=self.agent_id,
-                status=TaskStatus.COMPLETED,
-                result=verified_result,
-                confidence=self._calculate_confidence(verified_result),
-                reasoning=plan.get('reasoning', ''),
-                execution_time=execution_time
-            )
+            if plan.get('delegate_to'):
+                result = await self._delegate_async(task, plan['delegate_to'])
+            elif plan.get('use_tools'):
+                result = await asyncio.to_thread(self._use_tools, task, plan['use_tools'])
+            else:
+                result = await self._generate_response_async(task)
             
-            self.task_history.append(task_result)
-            return task_result
+            return self._complete(task, plan, result, start_time)
             
         except Exception as e:
-            return TaskResult(
-                task_id=task.task_id,
-                agent_id=self.agent_id,
-                status=TaskStatus.FAILED,
-                result={"error": str(e)},
-                confidence=0.0,
-                reasoning=f"Execution failed: {str(e)}",
-                execution_time=time.time() - start_time
-            )
+            return self._failed(task, e, start_time)
     
-    async def execute_async(self, task: Task) -> TaskResult:
-        """Async version of execute"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.execute, task)
+    def _complete(self, task: Task, plan: Dict[str, Any], result: Dict, start_time: float) -> TaskResult:
+        """Verify a result and record it as a completed task"""
+        # Step 3: Verify result
+        verified_result = self._verify(task, result)
+        
+        execution_time = time.time() - start_time
+        
+        task_result = TaskResult(
+            task_id=task.task_id,
+            agent_id=self.agent_id,
+            status=TaskStatus.COMPLETED,
+            result=verified_result,
+            confidence=self._calculate_confidence(verified_result),
+            reasoning=plan.get('reasoning', ''),
+            execution_time=execution_time
+        )
+        
+        self.task_history.append(task_result)
+        return task_result
+    
+    def _failed(self, task: Task, error: Exception, start_time: float) -> TaskResult:
+        """Result for a task whose execution raised"""
+        return TaskResult(
+            task_id=task.task_id,
+            agent_id=self.agent_id,
+            status=TaskStatus.FAILED,
+            result={"error": str(error)},
+            confidence=0.0,
+            reasoning=f"Execution failed: {str(error)}",
+            execution_time=time.time() - start_time
+        )
     
     def _plan(self, task: Task) -> Dict[str, Any]:
         """Plan how to handle the task"""
-        content = task.content.lower()
-        
         # Check if should delegate
         for agent_id, agent in self.sub_agents.items():
             if self._should_delegate(task, agent):
@@ -323,19 +370,57 @@ class BaseAgent(ABC):
             return result.result
         return {"error": f"Agent {agent_id} not found"}
     
+    async def _delegate_async(self, task: Task, agent_id: str) -> Dict[str, Any]:
+        """Async version of _delegate"""
+        agent = self.sub_agents.get(agent_id)
+        if agent:
+            result = await agent.execute_async(task)
+            return result.result
+        return {"error": f"Agent {agent_id} not found"}
+    
+    def _ai_config(self, task: Task):
+        """Generation config for a task - only its response budget varies"""
+        config = self._ai_configs.get(task.response_budget)
+        if config is None:
+            config = genai_modules()[1].GenerateContentConfig(
+                system_instruction=self.system_instruction,
+                temperature=0.7,
+                max_output_tokens=task.response_budget.value
+            )
+            self._ai_configs[task.response_budget] = config
+        return config
+    
+    def _ai_request(self, task: Task) -> Dict[str, Any]:
+        """Keyword arguments of the generate_content call for a task"""
+        return {
+            'model': self.model,
+            'contents': task.content,
+            'config': self._ai_config(task)
+        }
+    
     def _generate_response(self, task: Task) -> Dict[str, Any]:
         """Generate response using Gemini"""
         if self._client:
             try:
-                response = self._client.models.generate_content(
-                    model=self.model,
-                    contents=task.content,
-                    config=types.GenerateContentConfig(
-                        system_instruction=self.system_instruction,
-                        temperature=0.7,
-                        max_output_tokens=1024
-                    )
-                )
+                response = self._client.models.generate_content(**self._ai_request(task))
+                return {"response": response.text}
+            except Exception as e:
+                return {"error": str(e)}
+        return {"response": self._fallback_response(task)}
+    
+    async def _generate_response_async(self, task: Task) -> Dict[str, Any]:
+        """
+        Async version of _generate_response
+        
+        Awaits the async Gemini client. A subclass that overrides only the
+        sync _generate_response may block, so its override runs in the
+        default executor instead.
+        """
+        if type(self)._generate_response is not BaseAgent._generate_response:
+            return await asyncio.to_thread(self._generate_response, task)
+        if self._client:
+            try:
+                response = await self._client.aio.models.generate_content(**self._ai_request(task))
                 return {"response": response.text}
             except Exception as e:
                 return {"error": str(e)}
@@ -381,14 +466,18 @@ class MultiAgentOrchestrator:
     Supports:
     - Sequential execution
     - Parallel execution
+    - Dependency-ordered (DAG) execution
     - Hierarchical delegation
     - Agent-to-Agent communication
     """
     
+    # Audit entries kept in memory - the oldest are dropped first
+    EXECUTION_LOG_SIZE = 10_000
+    
     def __init__(self, orchestrator_id: str = "main_orchestrator"):
         self.orchestrator_id = orchestrator_id
         self.agents: Dict[str, BaseAgent] = {}
-        self.execution_log: List[Dict] = []
+        self.execution_log: Deque[Dict] = deque(maxlen=self.EXECUTION_LOG_SIZE)
     
     def register_agent(self, agent: BaseAgent):
         """Register an agent with the orchestrator"""
@@ -444,6 +533,85 @@ class MultiAgentOrchestrator:
         
         return list(results)
     
+    async def execute_dag(self, task: Task, dependencies: Dict[str, List[str]]) -> List[TaskResult]:
+        """
+        Execute task across agents in dependency order
+        
+        dependencies maps each agent to the agents whose results it needs; an
+        agent named only as a dependency needs none. Agents run in waves -
+        every agent whose dependencies have finished runs in parallel with
+        the others of its wave - and each one finds its dependencies' results
+        in context.metadata['previous_results'].
+        
+        An agent with a failed dependency is not run and is reported as
+        failed itself. Unknown agents and dependency cycles raise ValueError
+        before any agent runs.
+        """
+        graph: Dict[str, List[str]] = {}
+        for agent_id, deps in dependencies.items():
+            graph[agent_id] = list(deps)
+            for dep in deps:
+                graph.setdefault(dep, [])
+        for agent_id in graph:
+            if agent_id not in self.agents:
+                raise ValueError(f"Agent {agent_id} not found")
+        
+        # Plan every wave first, so an invalid graph runs nothing
+        waves: List[List[str]] = []
+        pending = dict(graph)
+        planned = set()
+        while pending:
+            wave = [agent_id for agent_id, deps in pending.items() if planned.issuperset(deps)]
+            if not wave:
+                raise ValueError(f"Dependency cycle between agents: {', '.join(pending)}")
+            for agent_id in wave:
+                del pending[agent_id]
+            planned.update(wave)
+            waves.append(wave)
+        
+        done: Dict[str, TaskResult] = {}
+        results = []
+        
+        for wave in waves:
+            outcomes: Dict[str, TaskResult] = {}
+            runs = {}
+            for agent_id in wave:
+                agent_task_id = f"{task.task_id}_{agent_id}"
+                failed = [dep for dep in graph[agent_id] if done[dep].status == TaskStatus.FAILED]
+                if failed:
+                    outcomes[agent_id] = TaskResult(
+                        task_id=agent_task_id,
+                        agent_id=agent_id,
+                        status=TaskStatus.FAILED,
+                        result={"error": f"Dependencies failed: {', '.join(failed)}"},
+                        confidence=0.0,
+                        reasoning="Not run - a dependency failed"
+                    )
+                    continue
+                
+                context = replace(task.context, metadata={
+                    **task.context.metadata,
+                    'previous_results': {dep: done[dep].result for dep in graph[agent_id]}
+                })
+                agent_task = Task(
+                    task_id=agent_task_id,
+                    task_type=task.task_type,
+                    content=task.content,
+                    context=context,
+                    parent_task_id=task.task_id
+                )
+                runs[agent_id] = self.agents[agent_id].execute_async(agent_task)
+            
+            outcomes.update(zip(runs, await asyncio.gather(*runs.values())))
+            
+            for agent_id in wave:
+                result = outcomes[agent_id]
+                done[agent_id] = result
+                results.append(result)
+                self._log_execution(agent_id, result)
+        
+        return results
+    
     def execute_hierarchical(self, task: Task, root_agent_id: str) -> TaskResult:
         """Execute with hierarchical delegation"""
         root_agent = self.agents.get(root_agent_id)
@@ -461,22 +629,23 @@ class MultiAgentOrchestrator:
         if not results:
             return {"status": "no_results"}
         
+        confidences = [r.confidence for r in results]
+        
         # Calculate combined confidence
-        total_confidence = sum(r.confidence for r in results)
-        avg_confidence = total_confidence / len(results)
+        avg_confidence = sum(confidences) / len(results)
         
-        # Find highest risk/priority result
-        max_risk_result = max(results, key=lambda r: 1 - r.confidence)
+        # Find highest risk/priority result - the least confident one
+        max_risk_result = results[confidences.index(min(confidences))]
         
         # Aggregate all findings
-        all_findings = []
-        for r in results:
-            if isinstance(r.result, dict):
-                all_findings.append({
-                    "agent": r.agent_id,
-                    "result": r.result,
-                    "confidence": r.confidence
-                })
+        all_findings = [
+            {
+                "agent": r.agent_id,
+                "result": r.result,
+                "confidence": r.confidence
+            }
+            for r in results if isinstance(r.result, dict)
+        ]
         
         return {
             "status": "aggregated",
@@ -495,12 +664,12 @@ class MultiAgentOrchestrator:
             "status": result.status.value,
             "confidence": result.confidence,
             "execution_time": result.execution_time,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_timestamp()
         })
     
     def get_execution_log(self) -> List[Dict]:
         """Get execution audit log"""
-        return self.execution_log
+        return list(self.execution_log)
 
 
 # =============================================================================
@@ -0,0 +1,114 @@
+"""
+Scalar Multi-Agent System - Analysis Cache
+Memoization for the pure, local analyze() methods of agents and tools
+
+The same scam template is forwarded to many users, so identical inputs are
+analyzed over and over. Results are cached per instance in a bounded LRU.
+Every call returns its own copy of the cached result, so callers may
+annotate it freely.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _text_digest(value: Any) -> Any:
+    """16-byte digest standing in for a str in a cache key"""
+    if not isinstance(value, str):
+        return value
+    return hashlib.blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def copy_result(value: Any) -> Any:
+    """Copy a result's nested dicts, lists and dataclasses, sharing the immutable leaves"""
+    if isinstance(value, dict):
+        return {key: copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_result(item) for item in value]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{
+            field.name: copy_result(getattr(value, field.name))
+            for field in dataclasses.fields(value) if field.init
+        })
+    return value
+
+
+def cached_analysis(
+    maxsize: int = 4096,
+    ignore: Iterable[str] = ('features',),
+    digest_text: bool = False
+) -> Callable:
+    """
+    Memoize an analyze-style method per instance
+
+    The cache key is the positional arguments plus keyword arguments, minus
+    the keyword arguments named in `ignore` - inputs such as precomputed
+    features that only speed up the computation without changing its result.
+    With `digest_text`, str arguments are keyed by a BLAKE2b digest so the
+    cache does not keep large documents alive. The cached result itself never
+    reaches a caller; each call gets a copy_result() of it.
+    """
+    ignored = frozenset(ignore)
+
+    def decorator(method: Callable) -> Callable:
+        cache_attr = f'_{method.__name__}_cache'
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.__dict__.get(cache_attr)
+            if cache is None:
+                cache = self.__dict__.setdefault(cache_attr, LRUCache(maxsize))
+
+            key = tuple(map(_text_digest, args)) if digest_text else args
+            if kwargs:
+                key += tuple(sorted(
+                    (k, _text_digest(v) if digest_text else v)
+                    for k, v in kwargs.items() if k not in ignored
+                ))
+
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = method(self, *args, **kwargs)
+                cache.put(key, result)
+            return copy_result(result)
+
+        return wrapper
+
+    return decorator
@@ -11,7 +11,11 @@ Provides singleton access to Google's Gemini API with:
 import os
 import time
 import asyncio
-from typing import Dict, List, Any, Optional, Generator, AsyncGenerator
+import hashlib
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Deque, Generator, AsyncGenerator
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -23,14 +27,34 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent.parent / '.env'
 load_dotenv(env_path)
 
-try:
-    from google import genai
-    from google.genai import types
-    GENAI_AVAILABLE = True
-except ImportError:
-    GENAI_AVAILABLE = False
-    genai = None
-    types = None
+from .analysis_cache import LRUCache
+
+
+@lru_cache(maxsize=None)
+def genai_modules():
+    """
+    (genai, types) from google-genai, or (None, None) if it isn't installed
+    
+    Imported on first use - the SDK pulls in google-auth, httpx and pydantic,
+    which local-only analysis never needs.
+    """
+    try:
+        from google import genai
+        from google.genai import types
+        return genai, types
+    except ImportError:
+        return None, None
+
+
+def __getattr__(name: str):
+    # Module attributes this file used to import eagerly
+    if name == 'genai':
+        return genai_modules()[0]
+    if name == 'types':
+        return genai_modules()[1]
+    if name == 'GENAI_AVAILABLE':
+        return genai_modules()[0] is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class GeminiModel(Enum):
@@ -40,12 +64,23 @@ class GeminiModel(Enum):
     GEMINI_1_5_FLASH = "gemini-1.5-flash"
 
 
-@dataclass
+# Messages of a session that are replayed as context - older ones are dropped
+SESSION_CONTEXT_MESSAGES = 10
+
+
+@dataclass(slots=True)
 class AgentSession:
-    """Tracks a multi-agent conversation session"""
+    """
+    Tracks a multi-agent conversation session
+    
+    Only the last SESSION_CONTEXT_MESSAGES messages are stored; older ones
+    are dropped as new ones arrive.
+    """
     session_id: str
     agent_ids: List[str]
-    messages: List[Dict[str, Any]] = field(default_factory=list)
+    messages: Deque[Dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=SESSION_CONTEXT_MESSAGES)
+    )
     context: Dict[str, Any] = field(default_factory=dict)
     created_at: float = field(default_factory=time.time)
     
@@ -59,33 +94,49 @@ class GeminiClient:
     - Multi-agent conversation management
     - Tool/function calling support
     - Async support for concurrent agent operations
+    - Response cache for repeated prompts
     """
     
     _instance = None
     _initialized = False
+    _lock = threading.Lock()
+    
+    # Forwarded scam templates repeat verbatim - identical requests are
+    # answered from memory for up to an hour
+    RESPONSE_CACHE_SIZE = 1024
+    RESPONSE_CACHE_TTL = 3600.0
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self):
         if GeminiClient._initialized:
             return
-            
-        self.api_key = os.getenv('GEMINI_API_KEY')
-        self.client = None
-        self.sessions: Dict[str, AgentSession] = {}
-        self.default_model = GeminiModel.GEMINI_2_FLASH
         
-        if GENAI_AVAILABLE and self.api_key:
-            self.client = genai.Client(api_key=self.api_key)
+        with GeminiClient._lock:
+            if GeminiClient._initialized:
+                return
+            
+            self.api_key = os.getenv('GEMINI_API_KEY')
+            self.client = None
+            self.sessions: Dict[str, AgentSession] = {}
+            self.default_model = GeminiModel.GEMINI_2_FLASH
+            self._responses = LRUCache(maxsize=self.RESPONSE_CACHE_SIZE)
             
-        GeminiClient._initialized = True
+            if self.api_key:
+                genai = genai_modules()[0]
+                if genai:
+                    self.client = genai.Client(api_key=self.api_key)
+            
+            GeminiClient._initialized = True
     
     def is_available(self) -> bool:
         """Check if Gemini client is properly configured"""
-        return GENAI_AVAILABLE and self.client is not None
+        return self.client is not None
     
     def test_connection(self) -> Dict[str, Any]:
         """Test API connection with a simple request"""
@@ -135,39 +186,90 @@ class GeminiClient:
         if not self.is_available():
             return self._fallback_response(prompt)
         
-        model_name = (model or self.default_model).value
+        request = self._request(prompt, system_instruction, model, temperature, max_tokens)
+        key = self._cache_key(request, system_instruction, temperature, max_tokens)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
         
         try:
-            config = types.GenerateContentConfig(
-                temperature=temperature,
-                max_output_tokens=max_tokens,
-            )
-            
-            if system_instruction:
-                config.system_instruction = system_instruction
-            
-            response = self.client.models.generate_content(
-                model=model_name,
-                contents=prompt,
-                config=config
-            )
-            
-            return {
-                'success': True,
-                'text': response.text,
-                'model': model_name,
-                'usage': {
-                    'prompt_tokens': getattr(response, 'prompt_token_count', 0),
-                    'response_tokens': getattr(response, 'candidates_token_count', 0)
-                }
-            }
-            
+            response = self.client.models.generate_content(**request)
+            return self._store_result(key, self._result(response, request['model']))
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'text': self._fallback_response(prompt).get('text', '')
+            return self._error_result(prompt, e)
+    
+    def _cache_key(
+        self,
+        request: Dict[str, Any],
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int
+    ) -> bytes:
+        """Digest identifying a request in the response cache"""
+        parts = (request['model'], system_instruction or '', request['contents'],
+                 repr(temperature), str(max_tokens))
+        data = '\0'.join(parts).encode('utf-8', 'surrogatepass')
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    def _cached_result(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Copy of a cached, unexpired response for key, if any"""
+        entry = self._responses.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return dict(entry[1], cached=True)
+    
+    def _store_result(self, key: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a successful response and return it"""
+        self._responses.put(key, (time.monotonic() + self.RESPONSE_CACHE_TTL, dict(result)))
+        return result
+    
+    def clear_cache(self):
+        """Drop all cached responses"""
+        self._responses.clear()
+    
+    def _request(
+        self,
+        prompt: str,
+        system_instruction: Optional[str],
+        model: Optional[GeminiModel],
+        temperature: float,
+        max_tokens: int
+    ) -> Dict[str, Any]:
+        """Keyword arguments of a generate_content call"""
+        types = genai_modules()[1]
+        config = types.GenerateContentConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+        
+        if system_instruction:
+            config.system_instruction = system_instruction
+        
+        return {
+            'model': (model or self.default_model).value,
+            'contents': prompt,
+            'config': config
+        }
+    
+    def _result(self, response, model_name: str) -> Dict[str, Any]:
+        """Response dict for a successful generation"""
+        return {
+            'success': True,
+            'text': response.text,
+            'model': model_name,
+            'usage': {
+                'prompt_tokens': getattr(response, 'prompt_token_count', 0),
+                'response_tokens': getattr(response, 'candidates_token_count', 0)
             }
+        }
+    
+    def _error_result(self, prompt: str, error: Exception) -> Dict[str, Any]:
+        """Response dict for a failed generation, carrying the fallback text"""
+        return {
+            'success': False,
+            'error': str(error),
+            'text': self._fallback_response(prompt).get('text', '')
+        }
     
     def generate_stream(
         self,
@@ -188,7 +290,7 @@ class GeminiClient:
         model_name = (model or self.default_model).value
         
         try:
-            config = types.GenerateContentConfig()
+            config = genai_modules()[1].GenerateContentConfig()
             if system_instruction:
                 config.system_instruction = system_instruction
             
@@ -209,15 +311,48 @@ class GeminiClient:
         self,
         prompt: str,
         system_instruction: Optional[str] = None,
-        model: Optional[GeminiModel] = None
+        model: Optional[GeminiModel] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2048
     ) -> Dict[str, Any]:
-        """Async version for concurrent multi-agent operations"""
-        # Run synchronous generation in executor
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.generate(prompt, system_instruction, model)
-        )
+        """
+        Async version for concurrent multi-agent operations
+        
+        Uses the SDK's native async client, so concurrent calls overlap their
+        HTTP requests on the event loop instead of each holding a thread.
+        """
+        if not self.is_available():
+            return self._fallback_response(prompt)
+        
+        request = self._request(prompt, system_instruction, model, temperature, max_tokens)
+        key = self._cache_key(request, system_instruction, temperature, max_tokens)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.client.aio.models.generate_content(**request)
+            return self._store_result(key, self._result(response, request['model']))
+        except Exception as e:
+            return self._error_result(prompt, e)
+    
+    async def generate_batch(
+        self,
+        prompts: List[Tuple[Optional[str], str]],
+        model: Optional[GeminiModel] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate for several (system_instruction, prompt) pairs concurrently
+        
+        Identical pairs share one request. Results come back in input order.
+        """
+        unique = list(dict.fromkeys(prompts))
+        responses = await asyncio.gather(*(
+            self.generate_async(prompt, system_instruction, model)
+            for system_instruction, prompt in unique
+        ))
+        by_pair = dict(zip(unique, responses))
+        return [by_pair[pair] for pair in prompts]
     
     def create_agent_session(self, session_id: str, agent_ids: List[str]) -> AgentSession:
         """Create a new multi-agent conversation session"""
@@ -266,7 +401,7 @@ class GeminiClient:
         # Build context from session history
         context_parts = []
         if session:
-            for msg in session.messages[-10:]:  # Last 10 messages
+            for msg in session.messages:  # Last SESSION_CONTEXT_MESSAGES messages
                 context_parts.append(f"[{msg['agent_id']}]: {msg['content']}")
         
         full_prompt = prompt
@@ -287,31 +422,33 @@ class GeminiClient:
     def _fallback_response(self, prompt: str) -> Dict[str, Any]:
         """Fallback response when Gemini is not available"""
         # Provide intelligent fallback based on prompt content
-        fallback_responses = {
-            'fraud': {
-                'text': 'Based on pattern analysis, this appears to be a potential fraud attempt. Key indicators: urgency language, request for payment/credentials, suspicious links.',
-                'confidence': 0.75
-            },
-            'scam': {
-                'text': 'This message shows characteristics of known scam patterns. Recommendation: Do not share personal information or click any links.',
-                'confidence': 0.8
-            },
-            'kyc': {
-                'text': 'KYC update requests should only come from official bank channels. Never download APK files from links in messages.',
-                'confidence': 0.85
-            },
-            'default': {
-                'text': 'Analysis complete. Please review the detailed results for recommendations.',
-                'confidence': 0.5
-            }
-        }
-        
         prompt_lower = prompt.lower()
-        for key, response in fallback_responses.items():
+        for key, response in FALLBACK_RESPONSES.items():
             if key in prompt_lower:
                 return {'success': True, 'text': response['text'], 'fallback': True}
         
-        return {'success': True, 'text': fallback_responses['default']['text'], 'fallback': True}
+        return {'success': True, 'text': FALLBACK_RESPONSES['default']['text'], 'fallback': True}
+
+
+# Offline responses, picked by the first key found in the prompt
+FALLBACK_RESPONSES = {
+    'fraud': {
+        'text': 'Based on pattern analysis, this appears to be a potential fraud attempt. Key indicators: urgency language, request for payment/credentials, suspicious links.',
+        'confidence': 0.75
+    },
+    'scam': {
+        'text': 'This message shows characteristics of known scam patterns. Recommendation: Do not share personal information or click any links.',
+        'confidence': 0.8
+    },
+    'kyc': {
+        'text': 'KYC update requests should only come from official bank channels. Never download APK files from links in messages.',
+        'confidence': 0.85
+    },
+    'default': {
+        'text': 'Analysis complete. Please review the detailed results for recommendations.',
+        'confidence': 0.5
+    }
+}
 
 
 # Agent-specific system instructions
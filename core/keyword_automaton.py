@@ -0,0 +1,286 @@
+"""
+Scalar Multi-Agent System - Keyword Automaton
+Multi-keyword substring matching for the fraud detectors
+
+Every detector checks a message against dozens of literal keywords. Instead of
+one `kw in text` probe per keyword, the keywords are compiled once into a
+multi-pattern matcher and the message is scanned in a single linear pass.
+
+Matching engines, fastest available first:
+- Hyperscan literal database (SIMD literal scanning)
+- pyahocorasick automaton
+- plain substring checks
+
+Hyperscan's per-call setup outweighs its scanning speed on short texts, so
+when both libraries are installed, texts under SHORT_TEXT_LIMIT characters
+(SMS, push notifications) go through the Aho-Corasick automaton instead.
+
+Single-character keywords ('₹') are kept out of the engines - they fire on
+every occurrence and weaken Hyperscan's literal filtering - and are checked
+with `in`, which CPython runs as a vectorized memchr.
+
+A batch of texts can be scanned with find_many(): the texts are joined with
+NUL separators and the engine runs once over the whole buffer, with matches
+attributed back to their text by offset.
+
+PatternMatcher builds on the automaton for lists of regex patterns, most of
+which are plain literals or start with one.
+"""
+
+import threading
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .regex_cache import compile_linear
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    hyperscan = None
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+
+# Below this many characters Aho-Corasick beats a Hyperscan call
+SHORT_TEXT_LIMIT = 200
+
+
+def _collect_match(expression_id: int, start: int, end: int, flags: int, found: Set[int]):
+    """Hyperscan match callback - records which expression fired"""
+    found.add(expression_id)
+
+
+def _collect_match_end(expression_id: int, start: int, end: int, flags: int, found: List[Tuple[int, int]]):
+    """Hyperscan match callback - records which expression fired and where it ended"""
+    found.append((expression_id, end))
+
+
+class _HyperscanDatabase:
+    """
+    Block-mode Hyperscan database reporting which expressions match
+
+    With single_match (the default) each expression is reported at most once
+    per scan, which is all scan() needs; matches() needs every occurrence.
+    """
+
+    def __init__(self, expressions: List[bytes], literal: bool, single_match: bool = True):
+        self._database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self._database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            flags=hyperscan.HS_FLAG_SINGLEMATCH if single_match else 0,
+            literal=literal
+        )
+        # Scratch space is per thread; clones are made on first use
+        self._scratch = hyperscan.Scratch(self._database)
+        self._local = threading.local()
+
+    def _run(self, data: bytes, handler, found):
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = self._scratch.clone()
+        self._database.scan(data, match_event_handler=handler, context=found, scratch=scratch)
+        return found
+
+    def scan(self, text: str) -> Set[int]:
+        """Ids of the expressions matching text"""
+        return self._run(text.encode('utf-8', 'surrogatepass'), _collect_match, set())
+
+    def matches(self, data: bytes) -> List[Tuple[int, int]]:
+        """(expression id, end offset) of every match in data"""
+        return self._run(data, _collect_match_end, [])
+
+
+class KeywordAutomaton:
+    """
+    Compiled multi-keyword matcher
+
+    Keywords are declared in named groups. A scan reports, for every group,
+    the keywords that occur in the text in declaration order - the same list
+    `[kw for kw in keywords if kw in text]` would build, in one pass.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups = {name: tuple(keywords) for name, keywords in groups.items()}
+        self._group_sets = {name: frozenset(keywords) for name, keywords in self.groups.items()}
+
+        # Distinct keywords; a keyword may belong to several groups
+        self._keywords = list(dict.fromkeys(
+            keyword for keywords in self.groups.values() for keyword in keywords
+        ))
+
+        self._chars = tuple(keyword for keyword in self._keywords if len(keyword) == 1)
+        self._multi = [keyword for keyword in self._keywords if len(keyword) > 1]
+
+        self._database = None
+        self._batch_database = None
+        self._automaton = None
+        if not self._multi:
+            return
+
+        if HYPERSCAN_AVAILABLE:
+            self._database = _HyperscanDatabase([kw.encode('utf-8') for kw in self._multi], literal=True)
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self._multi:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        """Distinct keywords across all groups"""
+        return tuple(self._keywords)
+
+    def find(self, text: str) -> Set[str]:
+        """Return the distinct keywords occurring in text"""
+        found = self._find_multi(text)
+        for char in self._chars:
+            if char in text:
+                found.add(char)
+        return found
+
+    def _find_multi(self, text: str) -> Set[str]:
+        """Distinct multi-character keywords occurring in text"""
+        if self._automaton is not None and (self._database is None or len(text) < SHORT_TEXT_LIMIT):
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        if self._database is not None:
+            return {self._multi[i] for i in self._database.scan(text)}
+        return {keyword for keyword in self._multi if keyword in text}
+
+    def find_many(self, texts: Sequence[str]) -> List[Set[str]]:
+        """find() for each of texts, with the engine run once over the batch"""
+        found = self._find_multi_many(texts)
+        for text, keywords in zip(texts, found):
+            for char in self._chars:
+                if char in text:
+                    keywords.add(char)
+        return found
+
+    def _find_multi_many(self, texts: Sequence[str]) -> List[Set[str]]:
+        """_find_multi() for each of texts"""
+        # NUL separates the texts, so no match can span two of them
+        if len(texts) < 2 or not self._multi or any('\0' in keyword for keyword in self._multi):
+            return [self._find_multi(text) for text in texts]
+        found: List[Set[str]] = [set() for _ in texts]
+        if HYPERSCAN_AVAILABLE:
+            if self._batch_database is None:
+                self._batch_database = _HyperscanDatabase(
+                    [kw.encode('utf-8') for kw in self._multi], literal=True, single_match=False
+                )
+            chunks = [text.encode('utf-8', 'surrogatepass') for text in texts]
+            starts, offset = [], 0
+            for chunk in chunks:
+                starts.append(offset)
+                offset += len(chunk) + 1
+            for keyword_id, end in self._batch_database.matches(b'\0'.join(chunks)):
+                found[bisect_right(starts, end - 1) - 1].add(self._multi[keyword_id])
+            return found
+        if self._automaton is not None:
+            starts, offset = [], 0
+            for text in texts:
+                starts.append(offset)
+                offset += len(text) + 1
+            # iter() reports the index of each match's last character
+            for last, keyword in self._automaton.iter('\0'.join(texts)):
+                found[bisect_right(starts, last) - 1].add(keyword)
+            return found
+        return [self._find_multi(text) for text in texts]
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Return the matched keywords of every group, in declaration order"""
+        found = self.find(text)
+        hits: Dict[str, List[str]] = {}
+        for name, keywords in self.groups.items():
+            if found.isdisjoint(self._group_sets[name]):
+                hits[name] = []
+            else:
+                hits[name] = [kw for kw in keywords if kw in found]
+        return hits
+
+
+def literal_prefix(pattern: str) -> Tuple[str, bool]:
+    """
+    Leading literal every match of a regex must start with
+
+    Returns the literal and whether it is the whole pattern. Patterns with a
+    top-level choice have no usable prefix.
+    """
+    if '|' in pattern:
+        return '', False
+    chars: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            chars.append(pattern[i + 1])
+            i += 2
+            continue
+        if char in '.^$*+?{}[]()\\':
+            # '?', '*' and '{' make the preceding character optional
+            if char in '*?{' and chars:
+                chars.pop()
+            return ''.join(chars), False
+        chars.append(char)
+        i += 1
+    return ''.join(chars), True
+
+
+class PatternMatcher:
+    """
+    Report which named groups of regex patterns match a text
+
+    All literal patterns and literal prefixes are found in one keyword scan.
+    A literal pattern is decided by the scan alone, a pattern with a literal
+    prefix only runs its regex when the prefix occurs - starting from its
+    first occurrence, as no match can begin earlier - and the rest always
+    run. A group matches when any of its patterns does.
+
+    Regexes are compiled with compile_linear: patterns such as `\\d+.*wait`
+    backtrack quadratically under `re` on long single-line documents.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        groups = {name: list(patterns) for name, patterns in groups.items()}
+        # name -> (literal patterns, [(prefix, regex)], regex of the unanchored rest)
+        self._groups: Dict[str, Tuple[frozenset, List[Tuple[str, object]], Optional[object]]] = {}
+        anchors: Dict[str, List[str]] = {}
+        for name, patterns in groups.items():
+            literals, guarded, unanchored = [], [], []
+            for pattern in patterns:
+                prefix, whole = literal_prefix(pattern)
+                if whole:
+                    literals.append(prefix)
+                elif prefix:
+                    guarded.append((prefix, compile_linear(pattern)))
+                else:
+                    unanchored.append(pattern)
+            self._groups[name] = (
+                frozenset(literals),
+                guarded,
+                compile_linear('|'.join(unanchored)) if unanchored else None
+            )
+            anchors[name] = literals + [prefix for prefix, _ in guarded]
+        self.keywords = KeywordAutomaton(anchors)
+
+    def matching(self, text: str) -> Set[str]:
+        """Names of the groups with at least one pattern matching text"""
+        found = self.keywords.find(text)
+        matched = set()
+        for name, (literals, guarded, unanchored) in self._groups.items():
+            if not literals.isdisjoint(found):
+                matched.add(name)
+            elif any(
+                prefix in found and regex.search(text, text.find(prefix))
+                for prefix, regex in guarded
+            ):
+                matched.add(name)
+            elif unanchored is not None and unanchored.search(text):
+                matched.add(name)
+        return matched
@@ -0,0 +1,38 @@
+"""
+Scalar Multi-Agent System - Lazy Class Attributes
+Class-level state built on first use instead of at import
+
+The detectors keep their keyword automata and pattern matchers on the class,
+so every instance shares one compiled copy. Building them in the class body
+compiles every engine database at import, which the API worker pays on cold
+start whether or not the detector is ever used.
+"""
+
+import threading
+from typing import Any, Callable
+
+
+class lazy_class_attribute:
+    """
+    Class attribute computed from the class on first access
+
+    The value then replaces the descriptor on the class it was computed for,
+    so later lookups are plain attribute reads.
+    """
+
+    def __init__(self, factory: Callable[[type], Any]):
+        self._factory = factory
+        self._name = factory.__name__
+        self._lock = threading.Lock()
+        self.__doc__ = factory.__doc__
+
+    def __set_name__(self, owner: type, name: str):
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        with self._lock:
+            value = owner.__dict__.get(self._name, self)
+            if value is self:
+                value = self._factory(owner)
+                setattr(owner, self._name, value)
+        return value
@@ -0,0 +1,133 @@
+"""
+Scalar Multi-Agent System - Regex Cache
+Process-wide registry of compiled regular expressions
+
+Agents and tools are instantiated per request in web workers and several of
+them share patterns (rate clauses, shortened URLs, APK links). Compiling
+through this registry means each distinct pattern is compiled once per
+process, and every later lookup is a dictionary hit.
+
+Patterns run against untrusted message text can be compiled with
+compile_linear(), which uses RE2 when it is installed. RE2 matches in linear
+time, so `a.*b` style patterns cannot backtrack quadratically on crafted input
+or on long single-line documents.
+"""
+
+import re
+import unicodedata
+from array import array
+from functools import lru_cache
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+    re2 = None
+
+# Backslash escapes. RE2 reads \d \s \w \b and their negations as ASCII-only
+# where `re` is Unicode-aware; \d and \s outside brackets are spelled out
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+_UNTRANSLATABLE = frozenset('DSwWbB')
+
+
+# The code points `re` matches with \d and \s, as inclusive ranges, for the
+# Unicode version below. Other versions scan the code space instead
+_CLASS_UNICODE_VERSION = '14.0.0'
+_CLASS_RANGES = {
+    'd': (
+        (0x30, 0x39), (0x660, 0x669), (0x6f0, 0x6f9), (0x7c0, 0x7c9), (0x966, 0x96f),
+        (0x9e6, 0x9ef), (0xa66, 0xa6f), (0xae6, 0xaef), (0xb66, 0xb6f), (0xbe6, 0xbef),
+        (0xc66, 0xc6f), (0xce6, 0xcef), (0xd66, 0xd6f), (0xde6, 0xdef), (0xe50, 0xe59),
+        (0xed0, 0xed9), (0xf20, 0xf29), (0x1040, 0x1049), (0x1090, 0x1099),
+        (0x17e0, 0x17e9), (0x1810, 0x1819), (0x1946, 0x194f), (0x19d0, 0x19d9),
+        (0x1a80, 0x1a89), (0x1a90, 0x1a99), (0x1b50, 0x1b59), (0x1bb0, 0x1bb9),
+        (0x1c40, 0x1c49), (0x1c50, 0x1c59), (0xa620, 0xa629), (0xa8d0, 0xa8d9),
+        (0xa900, 0xa909), (0xa9d0, 0xa9d9), (0xa9f0, 0xa9f9), (0xaa50, 0xaa59),
+        (0xabf0, 0xabf9), (0xff10, 0xff19), (0x104a0, 0x104a9), (0x10d30, 0x10d39),
+        (0x11066, 0x1106f), (0x110f0, 0x110f9), (0x11136, 0x1113f), (0x111d0, 0x111d9),
+        (0x112f0, 0x112f9), (0x11450, 0x11459), (0x114d0, 0x114d9), (0x11650, 0x11659),
+        (0x116c0, 0x116c9), (0x11730, 0x11739), (0x118e0, 0x118e9), (0x11950, 0x11959),
+        (0x11c50, 0x11c59), (0x11d50, 0x11d59), (0x11da0, 0x11da9), (0x16a60, 0x16a69),
+        (0x16ac0, 0x16ac9), (0x16b50, 0x16b59), (0x1d7ce, 0x1d7ff), (0x1e140, 0x1e149),
+        (0x1e2f0, 0x1e2f9), (0x1e950, 0x1e959), (0x1fbf0, 0x1fbf9),
+    ),
+    's': (
+        (0x9, 0xd), (0x1c, 0x20), (0x85, 0x85), (0xa0, 0xa0), (0x1680, 0x1680),
+        (0x2000, 0x200a), (0x2028, 0x2029), (0x202f, 0x202f), (0x205f, 0x205f),
+        (0x3000, 0x3000),
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def _unicode_class(escape: str) -> str:
+    """RE2 character class matching exactly what `re` matches with \\d or \\s"""
+    if unicodedata.unidata_version == _CLASS_UNICODE_VERSION:
+        ranges = _CLASS_RANGES[escape]
+    else:
+        code_points = array('I', range(0x110000)).tobytes().decode('utf-32-le', 'surrogatepass')
+        ranges = [
+            (match.start(), match.end() - 1)
+            for match in re.finditer('\\' + escape + '+', code_points)
+        ]
+    return '[' + ''.join(f'\\x{{{start:x}}}-\\x{{{end:x}}}' for start, end in ranges) + ']'
+
+
+def _re2_pattern(pattern: str):
+    """pattern rewritten to mean under RE2 what it means under `re`, or None"""
+    escapes = {m.group(1) for m in _ESCAPE_RE.finditer(pattern)}
+    if escapes & _UNTRANSLATABLE or ('d' in escapes or 's' in escapes) and '[' in pattern:
+        return None
+    return _ESCAPE_RE.sub(
+        lambda m: _unicode_class(m.group(1)) if m.group(1) in 'ds' else m.group(0),
+        pattern
+    )
+
+
+@lru_cache(maxsize=1024)
+def compile_re(pattern: str, flags: int = 0) -> "re.Pattern":
+    """Compile a pattern once and share it across all callers"""
+    return re.compile(pattern, flags)
+
+
+class _LinearPattern:
+    """RE2 pattern with its `re` twin for texts RE2 cannot encode"""
+
+    __slots__ = ('_linear', '_fallback', 'pattern')
+
+    def __init__(self, linear, fallback: "re.Pattern"):
+        self._linear = linear
+        self._fallback = fallback
+        self.pattern = fallback.pattern
+
+    def search(self, text: str, *args):
+        # RE2 works on UTF-8, which lone surrogates have no encoding in
+        try:
+            return self._linear.search(text, *args)
+        except UnicodeEncodeError:
+            return self._fallback.search(text, *args)
+
+
+@lru_cache(maxsize=1024)
+def compile_linear(pattern: str, flags: int = 0):
+    """
+    Compile a pattern with RE2 when available, else with `re`
+
+    Only re.IGNORECASE is carried over, and \\d and \\s are rewritten to the
+    Unicode classes `re` gives them. Patterns whose meaning would still differ
+    under RE2 (other flags, other Unicode character classes, lookaround and
+    other syntax RE2 rejects) fall back to compile_re, so results never depend
+    on which engine is installed. Only search() is provided on RE2 patterns;
+    texts with lone surrogates are searched with `re`.
+    """
+    translated = _re2_pattern(pattern) if RE2_AVAILABLE and not flags & ~re.IGNORECASE else None
+    if translated is not None:
+        options = re2.Options()
+        options.log_errors = False
+        options.case_sensitive = not flags & re.IGNORECASE
+        try:
+            return _LinearPattern(re2.compile(translated, options), compile_re(pattern, flags))
+        except re2.error:
+            pass
+    return compile_re(pattern, flags)
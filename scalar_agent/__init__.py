@@ -4,13 +4,163 @@ Complete fraud detection system with all tools
 """
 
 import re
+from bisect import bisect_right
+from functools import lru_cache, wraps
 from typing import Optional
 from google.adk.agents import Agent
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+
+def _keyword_matcher(keywords):
+    """
+    Build a function returning the set of keywords found in a lowercased text
+    
+    With pyahocorasick installed the text is scanned once for all keywords,
+    otherwise each keyword is checked with a substring test.
+    """
+    keywords = tuple(dict.fromkeys(keywords))
+    if not AHOCORASICK_AVAILABLE:
+        return lambda text: {keyword for keyword in keywords if keyword in text}
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return lambda text: {keyword for _, keyword in automaton.iter(text)}
+
+
+# Look-alike letters scammers swap in to slip past keyword checks, mapped to
+# the Latin letter they imitate, and invisible characters, which are dropped.
+# Look-alikes of letters among the ASCII characters themselves ('0' for 'o',
+# '1' for 'l') are not mapped, so amounts and rates still parse. Fullwidth
+# forms, digits included, become their ASCII characters ('１８%' -> '18%').
+CONFUSABLES = str.maketrans({
+    # Cyrillic
+    'А': 'A', 'В': 'B', 'Е': 'E', 'К': 'K', 'М': 'M', 'Н': 'H', 'О': 'O',
+    'Р': 'P', 'С': 'C', 'Т': 'T', 'Х': 'X', 'Ү': 'Y', 'І': 'I', 'Ј': 'J', 'Ѕ': 'S',
+    'а': 'a', 'е': 'e', 'о': 'o', 'р': 'p', 'с': 'c', 'у': 'y', 'х': 'x',
+    'і': 'i', 'ј': 'j', 'ѕ': 's', 'ԁ': 'd', 'ԛ': 'q', 'ԝ': 'w', 'һ': 'h',
+    # Turkish dotless i
+    'ı': 'i',
+    # Greek
+    'Α': 'A', 'Β': 'B', 'Ε': 'E', 'Ζ': 'Z', 'Η': 'H', 'Ι': 'I', 'Κ': 'K',
+    'Μ': 'M', 'Ν': 'N', 'Ο': 'O', 'Ρ': 'P', 'Τ': 'T', 'Υ': 'Y', 'Χ': 'X',
+    'ο': 'o', 'ν': 'v', 'ι': 'i', 'κ': 'k', 'ρ': 'p', 'τ': 't', 'υ': 'u',
+    # Zero-width and soft hyphen
+    '\u00ad': None, '\u200b': None, '\u200c': None, '\u200d': None,
+    '\u2060': None, '\ufeff': None,
+    # Fullwidth forms of printable ASCII
+    **{chr(0xFF01 + i): chr(0x21 + i) for i in range(94)}
+})
+
+
+# Forwarded scam templates arrive verbatim again and again, so the message
+# detectors memoize their results. Each call gets its own copy of the cached
+# result, so callers may annotate it freely.
+DETECTOR_CACHE_SIZE = 4096
+
+
+def _copy_result(value):
+    """Copy a tool result's nested dicts and lists, sharing the immutable leaves"""
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    return value
+
+
+def _memoized(typed: bool = False):
+    """lru_cache a detector, returning a fresh copy of the cached result per call"""
+    def decorator(detector):
+        cached = lru_cache(maxsize=DETECTOR_CACHE_SIZE, typed=typed)(detector)
+        
+        @wraps(detector)
+        def wrapper(*args, **kwargs):
+            return _copy_result(cached(*args, **kwargs))
+        
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    
+    return decorator
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text for matching, with look-alike and invisible characters undone"""
+    # Every confusable is non-ASCII, so plain ASCII text skips the translation
+    if not text.isascii():
+        text = text.translate(CONFUSABLES)
+    return text.lower()
+
 # =============================================================================
 # TOOL 1: UPI SCAM DETECTOR
 # =============================================================================
 
+# Scam patterns with risk scores
+SCAM_PATTERNS = {
+    'collect_scam': {
+        'keywords': ['collect request', 'accept to receive', 'pay to receive', 'claim prize'],
+        'risk': 0.98,
+        'explanation': 'UPI collect request scam - money debits from your account!'
+    },
+    'prize_lottery': {
+        'keywords': ['won lottery', 'prize money', 'lucky winner', 'claim reward', 'cashback'],
+        'risk': 0.95,
+        'explanation': 'Fake prize/lottery scam - you never entered any lottery!'
+    },
+    'refund_trick': {
+        'keywords': ['refund pending', 'reversal', 'failed transaction', 'enter pin to receive'],
+        'risk': 0.92,
+        'explanation': 'Fake refund trick - entering PIN debits money!'
+    },
+    'qr_scam': {
+        'keywords': ['scan qr', 'qr code', 'scan to receive', 'qr for payment'],
+        'risk': 0.90,
+        'explanation': 'QR code scam - scanning QR debits YOUR money!'
+    },
+    'marketplace_fraud': {
+        'keywords': ['olx', 'army person', 'crpf', 'posting transfer', 'urgent sale'],
+        'risk': 0.88,
+        'explanation': 'Marketplace fraud - fake buyer/seller scam'
+    }
+}
+
+URGENCY_WORDS = ('urgent', 'immediately', 'now only', 'limited time', 'expire today', '24 hours')
+
+SUSPICIOUS_AMOUNTS = frozenset({1, 10, 49999, 50000, 99999, 100000})
+
+# A risk at or above UPI_THREAT_THRESHOLDS[i] rates UPI_THREAT_LEVELS[i + 1]
+UPI_THREAT_THRESHOLDS = (0.4, 0.7, 0.9)
+UPI_THREAT_LEVELS = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+# (action, hindi) advice per threat level
+UPI_ADVICE = {
+    'CRITICAL': ('🚨 STOP! This is a SCAM! Do NOT proceed!', '🚨 रुकें! यह धोखाधड़ी है! आगे न बढ़ें! कोई OTP या PIN न दें!'),
+    'HIGH': ('⚠️ HIGH RISK! Do not accept this request.', '⚠️ उच्च जोखिम! इस रिक्वेस्ट को स्वीकार न करें!'),
+    'MEDIUM': ('⚡ Exercise caution. Verify before proceeding.', '⚡ सावधान! पहले जाँच करें।'),
+    'LOW': ('✅ Appears safe, but stay vigilant.', '✅ सुरक्षित लगता है।'),
+}
+
+# Scam keywords and urgency words, found in one scan
+_find_upi_keywords = _keyword_matcher(
+    [keyword for data in SCAM_PATTERNS.values() for keyword in data['keywords']]
+    + list(URGENCY_WORDS)
+)
+
+
+# typed: an amount of 50000 and 50000.0 are reported differently
+@_memoized(typed=True)
 def detect_upi_scam(message: str, amount: Optional[float] = None) -> dict:
     """
     Analyzes UPI transaction messages for fraud patterns including collect scams,
@@ -23,77 +173,31 @@ def detect_upi_scam(message: str, amount: Optional[float] = None) -> dict:
     Returns:
         dict: Detection result with risk_score, scam_type, red_flags, and Hindi warning.
     """
-    message_lower = message.lower()
-    
-    # Scam patterns with risk scores
-    SCAM_PATTERNS = {
-        'collect_scam': {
-            'keywords': ['collect request', 'accept to receive', 'pay to receive', 'claim prize'],
-            'risk': 0.98,
-            'explanation': 'UPI collect request scam - money debits from your account!'
-        },
-        'prize_lottery': {
-            'keywords': ['won lottery', 'prize money', 'lucky winner', 'claim reward', 'cashback'],
-            'risk': 0.95,
-            'explanation': 'Fake prize/lottery scam - you never entered any lottery!'
-        },
-        'refund_trick': {
-            'keywords': ['refund pending', 'reversal', 'failed transaction', 'enter pin to receive'],
-            'risk': 0.92,
-            'explanation': 'Fake refund trick - entering PIN debits money!'
-        },
-        'qr_scam': {
-            'keywords': ['scan qr', 'qr code', 'scan to receive', 'qr for payment'],
-            'risk': 0.90,
-            'explanation': 'QR code scam - scanning QR debits YOUR money!'
-        },
-        'marketplace_fraud': {
-            'keywords': ['olx', 'army person', 'crpf', 'posting transfer', 'urgent sale'],
-            'risk': 0.88,
-            'explanation': 'Marketplace fraud - fake buyer/seller scam'
-        }
-    }
+    found = _find_upi_keywords(_normalize(message))
     
     detected_scams = []
     max_risk = 0.0
     red_flags = []
     
     for scam_type, data in SCAM_PATTERNS.items():
-        for keyword in data['keywords']:
-            if keyword in message_lower:
-                detected_scams.append(scam_type)
-                max_risk = max(max_risk, data['risk'])
-                red_flags.append(data['explanation'])
-                break
+        if not found.isdisjoint(data['keywords']):
+            detected_scams.append(scam_type)
+            max_risk = max(max_risk, data['risk'])
+            red_flags.append(data['explanation'])
     
     # Check for urgency amplifiers
-    urgency_words = ['urgent', 'immediately', 'now only', 'limited time', 'expire today', '24 hours']
-    if any(word in message_lower for word in urgency_words):
+    if not found.isdisjoint(URGENCY_WORDS):
         max_risk = min(max_risk + 0.05, 1.0)
         red_flags.append('Urgency pressure tactic detected')
     
     # Check suspicious amounts
-    if amount and amount in [1, 10, 49999, 50000, 99999, 100000]:
+    if amount and amount in SUSPICIOUS_AMOUNTS:
         max_risk = min(max_risk + 0.05, 1.0)
         red_flags.append(f'Suspicious round amount: ₹{amount}')
     
     # Determine threat level
-    if max_risk >= 0.9:
-        threat_level = 'CRITICAL'
-        action = '🚨 STOP! This is a SCAM! Do NOT proceed!'
-        hindi = '🚨 रुकें! यह धोखाधड़ी है! आगे न बढ़ें! कोई OTP या PIN न दें!'
-    elif max_risk >= 0.7:
-        threat_level = 'HIGH'
-        action = '⚠️ HIGH RISK! Do not accept this request.'
-        hindi = '⚠️ उच्च जोखिम! इस रिक्वेस्ट को स्वीकार न करें!'
-    elif max_risk >= 0.4:
-        threat_level = 'MEDIUM'
-        action = '⚡ Exercise caution. Verify before proceeding.'
-        hindi = '⚡ सावधान! पहले जाँच करें।'
-    else:
-        threat_level = 'LOW'
-        action = '✅ Appears safe, but stay vigilant.'
-        hindi = '✅ सुरक्षित लगता है।'
+    threat_level = UPI_THREAT_LEVELS[bisect_right(UPI_THREAT_THRESHOLDS, max_risk)]
+    action, hindi = UPI_ADVICE[threat_level]
     
     return {
         "status": "success",
@@ -112,6 +216,113 @@ def detect_upi_scam(message: str, amount: Optional[float] = None) -> dict:
 # TOOL 2: KYC PHISHING DETECTOR
 # =============================================================================
 
+PHISHING_INDICATORS = {
+    'apk_malware': {
+        'patterns': [r'\.apk', r'download.*app', r'install.*apk', r'banking.*app.*link'],
+        'risk': 0.99,
+        'explanation': '🚨 APK MALWARE - Banks NEVER send app download links!'
+    },
+    'shortened_url': {
+        'patterns': [r'bit\.ly', r'tinyurl', r'goo\.gl', r't\.co', r'short\.'],
+        'risk': 0.85,
+        'explanation': '⚠️ Shortened URL hiding real malicious destination'
+    },
+    'fake_bank_link': {
+        'patterns': [r'sbi.*update', r'hdfc.*kyc', r'icici.*verify', r'axis.*confirm'],
+        'risk': 0.92,
+        'explanation': '🚨 Fake bank link - Real banks use official apps only'
+    },
+    'account_threat': {
+        'patterns': [r'block.*account', r'suspend', r'deactivate', r'close.*account'],
+        'risk': 0.80,
+        'explanation': '⚠️ Account blocking threat - Scare tactic by scammers'
+    },
+    'screen_share': {
+        'patterns': [r'anydesk', r'teamviewer', r'quicksupport', r'screen.*share'],
+        'risk': 0.97,
+        'explanation': '🚨 Screen sharing request - MAXIMUM DANGER!'
+    },
+    'otp_request': {
+        'patterns': [r'share.*otp', r'enter.*otp', r'send.*otp', r'tell.*otp'],
+        'risk': 0.98,
+        'explanation': '🚨 OTP sharing request - NEVER share OTP with anyone!'
+    },
+    'kyc_urgency': {
+        'patterns': [r'kyc.*expir', r'update.*kyc.*urgent', r'immediate.*kyc'],
+        'risk': 0.88,
+        'explanation': '⚠️ Fake KYC urgency - Banks give adequate time'
+    }
+}
+
+
+class _LinearPattern:
+    """RE2 pattern with its `re` twin for texts RE2 cannot encode"""
+    
+    __slots__ = ('_linear', '_fallback')
+    
+    def __init__(self, linear, fallback):
+        self._linear = linear
+        self._fallback = fallback
+    
+    def search(self, text: str):
+        # RE2 works on UTF-8, which lone surrogates have no encoding in
+        try:
+            return self._linear.search(text)
+        except UnicodeEncodeError:
+            return self._fallback.search(text)
+    
+    def finditer(self, text: str):
+        try:
+            return list(self._linear.finditer(text))
+        except UnicodeEncodeError:
+            return list(self._fallback.finditer(text))
+
+
+def _compile_phishing(pattern: str):
+    """
+    Compile a case-insensitive phishing pattern, with RE2 when installed
+    
+    The patterns are literals joined by '.*' gaps, which `re` can take
+    quadratic time on - 'download.*app' over a long text full of 'download'
+    and no 'app' retries the gap from every occurrence. RE2 matches in linear
+    time and, on normalized text, the same way.
+    """
+    fallback = re.compile(pattern, re.IGNORECASE)
+    if not RE2_AVAILABLE:
+        return fallback
+    options = re2.Options()
+    options.case_sensitive = False
+    options.log_errors = False
+    return _LinearPattern(re2.compile(pattern, options), fallback)
+
+
+# One compiled alternation per indicator, built once at import
+PHISHING_INDICATOR_RES = {
+    indicator_type: _compile_phishing('|'.join(data['patterns']))
+    for indicator_type, data in PHISHING_INDICATORS.items()
+}
+
+# Every indicator as a named group of one alternation - clean messages are
+# cleared in a single scan
+PHISHING_ANY_RE = _compile_phishing(
+    '|'.join(f"(?P<{indicator_type}>{'|'.join(data['patterns'])})"
+             for indicator_type, data in PHISHING_INDICATORS.items())
+)
+
+KYC_ACTION_WORDS = ('link', 'click', 'update')
+
+# A risk at or above PHISHING_THREAT_THRESHOLDS[i] rates PHISHING_THREAT_LEVELS[i + 1]
+PHISHING_THREAT_THRESHOLDS = (0.7, 0.9)
+PHISHING_THREAT_LEVELS = ('LOW', 'HIGH', 'CRITICAL')
+
+PHISHING_HINDI = {
+    'CRITICAL': '🚨 खतरा! यह फ़िशिंग है! कुछ भी क्लिक न करें! कोई APP डाउनलोड न करें!',
+    'HIGH': '⚠️ उच्च जोखिम! लिंक पर क्लिक न करें!',
+    'LOW': '✅ सुरक्षित लगता है।',
+}
+
+
+@_memoized()
 def detect_kyc_phishing(message: str) -> dict:
     """
     Detects fake KYC update scams including APK malware, fake bank links,
@@ -123,62 +334,30 @@ def detect_kyc_phishing(message: str) -> dict:
     Returns:
         dict: Detection result with phishing indicators and risk assessment.
     """
-    message_lower = message.lower()
+    message_lower = _normalize(message)
     
-    PHISHING_INDICATORS = {
-        'apk_malware': {
-            'patterns': [r'\.apk', r'download.*app', r'install.*apk', r'banking.*app.*link'],
-            'risk': 0.99,
-            'explanation': '🚨 APK MALWARE - Banks NEVER send app download links!'
-        },
-        'shortened_url': {
-            'patterns': [r'bit\.ly', r'tinyurl', r'goo\.gl', r't\.co', r'short\.'],
-            'risk': 0.85,
-            'explanation': '⚠️ Shortened URL hiding real malicious destination'
-        },
-        'fake_bank_link': {
-            'patterns': [r'sbi.*update', r'hdfc.*kyc', r'icici.*verify', r'axis.*confirm'],
-            'risk': 0.92,
-            'explanation': '🚨 Fake bank link - Real banks use official apps only'
-        },
-        'account_threat': {
-            'patterns': [r'block.*account', r'suspend', r'deactivate', r'close.*account'],
-            'risk': 0.80,
-            'explanation': '⚠️ Account blocking threat - Scare tactic by scammers'
-        },
-        'screen_share': {
-            'patterns': [r'anydesk', r'teamviewer', r'quicksupport', r'screen.*share'],
-            'risk': 0.97,
-            'explanation': '🚨 Screen sharing request - MAXIMUM DANGER!'
-        },
-        'otp_request': {
-            'patterns': [r'share.*otp', r'enter.*otp', r'send.*otp', r'tell.*otp'],
-            'risk': 0.98,
-            'explanation': '🚨 OTP sharing request - NEVER share OTP with anyone!'
-        },
-        'kyc_urgency': {
-            'patterns': [r'kyc.*expir', r'update.*kyc.*urgent', r'immediate.*kyc'],
-            'risk': 0.88,
-            'explanation': '⚠️ Fake KYC urgency - Banks give adequate time'
-        }
-    }
+    found = {match.lastgroup for match in PHISHING_ANY_RE.finditer(message_lower)}
+    if found:
+        # A match can cover another indicator's only match - check the rest
+        found.update(
+            indicator_type for indicator_type, regex in PHISHING_INDICATOR_RES.items()
+            if indicator_type not in found and regex.search(message_lower)
+        )
     
     detected = []
     max_risk = 0.0
     
     for indicator_type, data in PHISHING_INDICATORS.items():
-        for pattern in data['patterns']:
-            if re.search(pattern, message_lower, re.IGNORECASE):
-                detected.append({
-                    'type': indicator_type,
-                    'risk': data['risk'],
-                    'explanation': data['explanation']
-                })
-                max_risk = max(max_risk, data['risk'])
-                break
+        if indicator_type in found:
+            detected.append({
+                'type': indicator_type,
+                'risk': data['risk'],
+                'explanation': data['explanation']
+            })
+            max_risk = max(max_risk, data['risk'])
     
     # Additional KYC check
-    if 'kyc' in message_lower and any(w in message_lower for w in ['link', 'click', 'update']):
+    if 'kyc' in message_lower and any(w in message_lower for w in KYC_ACTION_WORDS):
         if max_risk < 0.85:
             max_risk = 0.85
             detected.append({
@@ -187,15 +366,8 @@ def detect_kyc_phishing(message: str) -> dict:
                 'explanation': '⚠️ KYC update via link - Banks use official apps!'
             })
     
-    if max_risk >= 0.9:
-        threat_level = 'CRITICAL'
-        hindi = '🚨 खतरा! यह फ़िशिंग है! कुछ भी क्लिक न करें! कोई APP डाउनलोड न करें!'
-    elif max_risk >= 0.7:
-        threat_level = 'HIGH'
-        hindi = '⚠️ उच्च जोखिम! लिंक पर क्लिक न करें!'
-    else:
-        threat_level = 'LOW'
-        hindi = '✅ सुरक्षित लगता है।'
+    threat_level = PHISHING_THREAT_LEVELS[bisect_right(PHISHING_THREAT_THRESHOLDS, max_risk)]
+    hindi = PHISHING_HINDI[threat_level]
     
     return {
         "status": "success",
@@ -218,6 +390,61 @@ def detect_kyc_phishing(message: str) -> dict:
 # TOOL 3: POLICE IMPERSONATION DETECTOR
 # =============================================================================
 
+AUTHORITY_KEYWORDS = [
+    'police', 'cbi', 'ed', 'enforcement directorate', 'crime branch',
+    'cyber cell', 'income tax', 'customs', 'narcotics', 'ncb',
+    'interpol', 'fir', 'warrant', 'court order', 'legal notice',
+    'supreme court', 'high court', 'rbi', 'sebi'
+]
+
+THREAT_INDICATORS = [
+    'arrest', 'custody', 'jail', 'prison', 'warrant issued',
+    'case registered', 'investigation', 'money laundering',
+    'illegal activity', 'suspicious transaction', 'linked to crime',
+    'aadhaar misused', 'pan linked'
+]
+
+MONEY_DEMANDS = [
+    'pay fine', 'transfer money', 'deposit', 'security money',
+    'clearance fee', 'bail amount', 'penalty', 'safe account',
+    'rbi account', 'government account', 'lakh', 'crore', '₹'
+]
+
+DIGITAL_ARREST_SIGNS = [
+    'stay on call', 'do not disconnect', 'video call', 'skype',
+    'whatsapp video', 'don\'t tell anyone', 'confidential',
+    'keep this secret', 'digital arrest'
+]
+
+# A risk at or above IMPERSONATION_THREAT_THRESHOLDS[i] rates IMPERSONATION_THREAT_LEVELS[i + 1]
+IMPERSONATION_THREAT_THRESHOLDS = (0.5, 0.8)
+IMPERSONATION_THREAT_LEVELS = ('LOW', 'HIGH', 'CRITICAL')
+
+# (action, hindi) advice per threat level
+IMPERSONATION_ADVICE = {
+    'CRITICAL': (
+        '🚨 HANG UP IMMEDIATELY! This is 100% FRAUD!',
+        '''🚨 तुरंत फोन काटें! यह धोखाधड़ी है!
+
+असली पुलिस कभी फोन पर पैसे नहीं मांगती!
+"डिजिटल अरेस्ट" असली नहीं है - यह स्कैम है!
+
+हेल्पलाइन: 1930
+पोर्टल: cybercrime.gov.in'''
+    ),
+    'HIGH': (
+        '⚠️ Likely impersonation. Disconnect and verify independently.',
+        '⚠️ संभावित धोखाधड़ी। फोन काटें और स्वतंत्र रूप से सत्यापित करें।'
+    ),
+    'LOW': ('Low risk detected.', 'कम जोखिम।'),
+}
+
+_find_impersonation_keywords = _keyword_matcher(
+    AUTHORITY_KEYWORDS + THREAT_INDICATORS + MONEY_DEMANDS + DIGITAL_ARREST_SIGNS
+)
+
+
+@_memoized()
 def detect_police_impersonation(message: str) -> dict:
     """
     Detects fake police, CBI, ED, and other law enforcement impersonation scams.
@@ -229,38 +456,12 @@ def detect_police_impersonation(message: str) -> dict:
     Returns:
         dict: Detection result with impersonation indicators and emergency guidance.
     """
-    message_lower = message.lower()
+    found = _find_impersonation_keywords(_normalize(message))
     
-    AUTHORITY_KEYWORDS = [
-        'police', 'cbi', 'ed', 'enforcement directorate', 'crime branch',
-        'cyber cell', 'income tax', 'customs', 'narcotics', 'ncb',
-        'interpol', 'fir', 'warrant', 'court order', 'legal notice',
-        'supreme court', 'high court', 'rbi', 'sebi'
-    ]
-    
-    THREAT_INDICATORS = [
-        'arrest', 'custody', 'jail', 'prison', 'warrant issued',
-        'case registered', 'investigation', 'money laundering',
-        'illegal activity', 'suspicious transaction', 'linked to crime',
-        'aadhaar misused', 'pan linked'
-    ]
-    
-    MONEY_DEMANDS = [
-        'pay fine', 'transfer money', 'deposit', 'security money',
-        'clearance fee', 'bail amount', 'penalty', 'safe account',
-        'rbi account', 'government account', 'lakh', 'crore', '₹'
-    ]
-    
-    DIGITAL_ARREST_SIGNS = [
-        'stay on call', 'do not disconnect', 'video call', 'skype',
-        'whatsapp video', 'don\'t tell anyone', 'confidential',
-        'keep this secret', 'digital arrest'
-    ]
-    
-    auth_hits = [kw for kw in AUTHORITY_KEYWORDS if kw in message_lower]
-    threat_hits = [t for t in THREAT_INDICATORS if t in message_lower]
-    money_hits = [m for m in MONEY_DEMANDS if m in message_lower]
-    digital_arrest = [d for d in DIGITAL_ARREST_SIGNS if d in message_lower]
+    auth_hits = [kw for kw in AUTHORITY_KEYWORDS if kw in found]
+    threat_hits = [t for t in THREAT_INDICATORS if t in found]
+    money_hits = [m for m in MONEY_DEMANDS if m in found]
+    digital_arrest = [d for d in DIGITAL_ARREST_SIGNS if d in found]
     
     # Calculate risk
     risk_score = 0.0
@@ -275,24 +476,8 @@ def detect_police_impersonation(message: str) -> dict:
     
     risk_score = min(risk_score, 1.0)
     
-    if risk_score >= 0.8:
-        threat_level = 'CRITICAL'
-        action = '🚨 HANG UP IMMEDIATELY! This is 100% FRAUD!'
-        hindi = '''🚨 तुरंत फोन काटें! यह धोखाधड़ी है!
-
-असली पुलिस कभी फोन पर पैसे नहीं मांगती!
-"डिजिटल अरेस्ट" असली नहीं है - यह स्कैम है!
-
-हेल्पलाइन: 1930
-पोर्टल: cybercrime.gov.in'''
-    elif risk_score >= 0.5:
-        threat_level = 'HIGH'
-        action = '⚠️ Likely impersonation. Disconnect and verify independently.'
-        hindi = '⚠️ संभावित धोखाधड़ी। फोन काटें और स्वतंत्र रूप से सत्यापित करें।'
-    else:
-        threat_level = 'LOW'
-        action = 'Low risk detected.'
-        hindi = 'कम जोखिम।'
+    threat_level = IMPERSONATION_THREAT_LEVELS[bisect_right(IMPERSONATION_THREAT_THRESHOLDS, risk_score)]
+    action, hindi = IMPERSONATION_ADVICE[threat_level]
     
     return {
         "status": "success",
@@ -324,6 +509,48 @@ def detect_police_impersonation(message: str) -> dict:
 # TOOL 4: LOAN AGREEMENT DECODER
 # =============================================================================
 
+# Quoted interest rate, e.g. "18.5% p.a."
+INTEREST_RATE_RE = re.compile(r'(\d+\.?\d*)\s*%\s*(p\.?a\.?|per annum)?')
+
+HIDDEN_TERMS = {
+    'processing_fee': {
+        'patterns': ['processing fee', 'documentation charge', 'administrative fee'],
+        'risk': 'MEDIUM',
+        'explanation': 'Processing fees add to total loan cost'
+    },
+    'foreclosure_penalty': {
+        'patterns': ['foreclosure charge', 'prepayment penalty', 'early closure fee', 'part payment charge'],
+        'risk': 'HIGH',
+        'explanation': 'Penalty for paying off loan early - restricts your freedom'
+    },
+    'floating_rate': {
+        'patterns': ['floating rate', 'variable interest', 'linked to repo', 'mclr', 'subject to change'],
+        'risk': 'MEDIUM',
+        'explanation': 'Interest rate can increase without notice'
+    },
+    'forced_insurance': {
+        'patterns': ['mandatory insurance', 'credit protect', 'loan cover', 'protection plan required'],
+        'risk': 'HIGH',
+        'explanation': 'Forced insurance adds unnecessary cost'
+    },
+    'penal_interest': {
+        'patterns': ['penal interest', 'default charge', 'late payment fee', 'penalty interest'],
+        'risk': 'HIGH',
+        'explanation': 'Extra interest on missed payments - can compound quickly'
+    },
+    'cross_default': {
+        'patterns': ['cross default', 'other loans', 'all loans due'],
+        'risk': 'CRITICAL',
+        'explanation': 'Default on one loan triggers all loans becoming due'
+    },
+    'arbitration_clause': {
+        'patterns': ['arbitration', 'no court', 'dispute resolution'],
+        'risk': 'MEDIUM',
+        'explanation': 'Limits your legal options in case of dispute'
+    }
+}
+
+
 def decode_loan_agreement(document_text: str) -> dict:
     """
     Analyzes loan agreements for hidden fees, unfair terms, foreclosure penalties,
@@ -335,45 +562,7 @@ def decode_loan_agreement(document_text: str) -> dict:
     Returns:
         dict: Analysis with hidden terms, risk assessment, and recommendations.
     """
-    text_lower = document_text.lower()
-    
-    HIDDEN_TERMS = {
-        'processing_fee': {
-            'patterns': ['processing fee', 'documentation charge', 'administrative fee'],
-            'risk': 'MEDIUM',
-            'explanation': 'Processing fees add to total loan cost'
-        },
-        'foreclosure_penalty': {
-            'patterns': ['foreclosure charge', 'prepayment penalty', 'early closure fee', 'part payment charge'],
-            'risk': 'HIGH',
-            'explanation': 'Penalty for paying off loan early - restricts your freedom'
-        },
-        'floating_rate': {
-            'patterns': ['floating rate', 'variable interest', 'linked to repo', 'mclr', 'subject to change'],
-            'risk': 'MEDIUM',
-            'explanation': 'Interest rate can increase without notice'
-        },
-        'forced_insurance': {
-            'patterns': ['mandatory insurance', 'credit protect', 'loan cover', 'protection plan required'],
-            'risk': 'HIGH',
-            'explanation': 'Forced insurance adds unnecessary cost'
-        },
-        'penal_interest': {
-            'patterns': ['penal interest', 'default charge', 'late payment fee', 'penalty interest'],
-            'risk': 'HIGH',
-            'explanation': 'Extra interest on missed payments - can compound quickly'
-        },
-        'cross_default': {
-            'patterns': ['cross default', 'other loans', 'all loans due'],
-            'risk': 'CRITICAL',
-            'explanation': 'Default on one loan triggers all loans becoming due'
-        },
-        'arbitration_clause': {
-            'patterns': ['arbitration', 'no court', 'dispute resolution'],
-            'risk': 'MEDIUM',
-            'explanation': 'Limits your legal options in case of dispute'
-        }
-    }
+    text_lower = _normalize(document_text)
     
     found_issues = []
     
@@ -389,7 +578,7 @@ def decode_loan_agreement(document_text: str) -> dict:
                 break
     
     # Extract interest rate if mentioned
-    rate_match = re.search(r'(\d+\.?\d*)\s*%\s*(p\.?a\.?|per annum)?', text_lower)
+    rate_match = INTEREST_RATE_RE.search(text_lower) if '%' in text_lower else None
     interest_rate = float(rate_match.group(1)) if rate_match else None
     
     if interest_rate:
@@ -447,6 +636,53 @@ def decode_loan_agreement(document_text: str) -> dict:
 # TOOL 5: INSURANCE POLICY DECODER
 # =============================================================================
 
+# Sum insured, e.g. "5 lakh"
+SUM_INSURED_RE = re.compile(r'(\d+)\s*(lakh|lac|crore)')
+
+POLICY_ISSUES = {
+    'pre_existing': {
+        'patterns': ['pre-existing', 'prior condition', 'existing disease', 'ongoing treatment'],
+        'risk': 'HIGH',
+        'explanation': 'Pre-existing conditions may not be covered initially'
+    },
+    'waiting_period': {
+        'patterns': ['waiting period', 'cooling off', 'initial wait', '30 days wait', '90 days wait'],
+        'risk': 'MEDIUM',
+        'explanation': 'No coverage during waiting period'
+    },
+    'room_rent_cap': {
+        'patterns': ['room rent limit', 'per day maximum', 'room rent cap', '1% of sum insured'],
+        'risk': 'HIGH',
+        'explanation': 'Room rent cap limits hospital room choice'
+    },
+    'co_payment': {
+        'patterns': ['co-pay', 'copay', 'co-insurance', 'you pay', 'deductible'],
+        'risk': 'MEDIUM',
+        'explanation': 'You pay a percentage of every claim'
+    },
+    'exclusions': {
+        'patterns': ['not covered', 'excluded', 'exception', 'does not include'],
+        'risk': 'HIGH',
+        'explanation': 'Critical exclusions can leave you unprotected'
+    },
+    'age_limit': {
+        'patterns': ['age limit', 'maximum age', 'entry age', 'renewal age'],
+        'risk': 'MEDIUM',
+        'explanation': 'Policy may not cover you after certain age'
+    },
+    'claim_limit': {
+        'patterns': ['claim limit', 'maximum claims', 'annual limit', 'per illness cap'],
+        'risk': 'MEDIUM',
+        'explanation': 'Limits on number or amount of claims per year'
+    },
+    'network_hospital': {
+        'patterns': ['network hospital only', 'empanelled hospital', 'approved facility'],
+        'risk': 'LOW',
+        'explanation': 'Cashless only at specific hospitals'
+    }
+}
+
+
 def decode_insurance_policy(policy_text: str) -> dict:
     """
     Analyzes insurance policies for exclusions, waiting periods, sub-limits,
@@ -458,50 +694,7 @@ def decode_insurance_policy(policy_text: str) -> dict:
     Returns:
         dict: Analysis with exclusions, limitations, and coverage gaps.
     """
-    text_lower = policy_text.lower()
-    
-    POLICY_ISSUES = {
-        'pre_existing': {
-            'patterns': ['pre-existing', 'prior condition', 'existing disease', 'ongoing treatment'],
-            'risk': 'HIGH',
-            'explanation': 'Pre-existing conditions may not be covered initially'
-        },
-        'waiting_period': {
-            'patterns': ['waiting period', 'cooling off', 'initial wait', '30 days wait', '90 days wait'],
-            'risk': 'MEDIUM',
-            'explanation': 'No coverage during waiting period'
-        },
-        'room_rent_cap': {
-            'patterns': ['room rent limit', 'per day maximum', 'room rent cap', '1% of sum insured'],
-            'risk': 'HIGH',
-            'explanation': 'Room rent cap limits hospital room choice'
-        },
-        'co_payment': {
-            'patterns': ['co-pay', 'copay', 'co-insurance', 'you pay', 'deductible'],
-            'risk': 'MEDIUM',
-            'explanation': 'You pay a percentage of every claim'
-        },
-        'exclusions': {
-            'patterns': ['not covered', 'excluded', 'exception', 'does not include'],
-            'risk': 'HIGH',
-            'explanation': 'Critical exclusions can leave you unprotected'
-        },
-        'age_limit': {
-            'patterns': ['age limit', 'maximum age', 'entry age', 'renewal age'],
-            'risk': 'MEDIUM',
-            'explanation': 'Policy may not cover you after certain age'
-        },
-        'claim_limit': {
-            'patterns': ['claim limit', 'maximum claims', 'annual limit', 'per illness cap'],
-            'risk': 'MEDIUM',
-            'explanation': 'Limits on number or amount of claims per year'
-        },
-        'network_hospital': {
-            'patterns': ['network hospital only', 'empanelled hospital', 'approved facility'],
-            'risk': 'LOW',
-            'explanation': 'Cashless only at specific hospitals'
-        }
-    }
+    text_lower = _normalize(policy_text)
     
     found_issues = []
     
@@ -517,7 +710,7 @@ def decode_insurance_policy(policy_text: str) -> dict:
                 break
     
     # Extract sum insured if mentioned
-    sum_match = re.search(r'(\d+)\s*(lakh|lac|crore)', text_lower)
+    sum_match = SUM_INSURED_RE.search(text_lower)
     sum_insured = None
     if sum_match:
         amount = int(sum_match.group(1))
@@ -560,6 +753,42 @@ def decode_insurance_policy(policy_text: str) -> dict:
 # TOOL 6: INVESTMENT FRAUD DETECTOR
 # =============================================================================
 
+# Unrealistic periodic return claims, e.g. "5% daily"
+RETURN_CLAIM_RE = re.compile(r'(\d+)\s*%\s*(daily|weekly|monthly|per month|per day)')
+
+SCAM_INDICATORS = [
+    'guaranteed returns', 'risk-free investment', 'double your money',
+    'triple your money', '100% profit', 'fixed return', 'no loss possible',
+    'sure profit', 'assured income', 'money back guarantee investment'
+]
+
+RED_FLAGS = [
+    'referral bonus', 'mlm', 'network marketing', 'recruit members',
+    'joining fee', 'registration fee', 'crypto trading group',
+    'forex signal', 'binary options', 'daily profit', 'weekly returns',
+    'monthly guaranteed', 'whatsapp trading'
+]
+
+UNREALISTIC_RETURNS = [
+    'daily 1%', 'daily 2%', 'weekly 10%', 'monthly 15%', 'monthly 20%',
+    '100% in', '200% in', '500% in'
+]
+
+_find_investment_keywords = _keyword_matcher(SCAM_INDICATORS + RED_FLAGS + UNREALISTIC_RETURNS)
+
+# A risk at or above INVESTMENT_THREAT_THRESHOLDS[i] rates INVESTMENT_THREAT_LEVELS[i + 1]
+INVESTMENT_THREAT_THRESHOLDS = (0.5, 0.8)
+INVESTMENT_THREAT_LEVELS = ('LOW', 'HIGH', 'CRITICAL')
+
+# (action, hindi) advice per threat level
+INVESTMENT_ADVICE = {
+    'CRITICAL': ('🚨 This is a PONZI SCHEME! Do NOT invest!', '🚨 यह पोंजी स्कीम है! पैसे न लगाएं! SEBI पंजीकरण जांचें: sebi.gov.in'),
+    'HIGH': ('⚠️ High risk of fraud. Verify SEBI registration before investing.', '⚠️ धोखाधड़ी का खतरा। SEBI पंजीकरण जांचें।'),
+    'LOW': ('Low risk. Still verify with SEBI before investing.', 'कम जोखिम। फिर भी SEBI से जांचें।'),
+}
+
+
+@_memoized()
 def detect_investment_fraud(message: str) -> dict:
     """
     Detects investment scams including Ponzi schemes, fake crypto platforms,
@@ -571,29 +800,12 @@ def detect_investment_fraud(message: str) -> dict:
     Returns:
         dict: Detection result with fraud indicators and SEBI warning.
     """
-    message_lower = message.lower()
+    message_lower = _normalize(message)
+    found = _find_investment_keywords(message_lower)
     
-    SCAM_INDICATORS = [
-        'guaranteed returns', 'risk-free investment', 'double your money',
-        'triple your money', '100% profit', 'fixed return', 'no loss possible',
-        'sure profit', 'assured income', 'money back guarantee investment'
-    ]
-    
-    RED_FLAGS = [
-        'referral bonus', 'mlm', 'network marketing', 'recruit members',
-        'joining fee', 'registration fee', 'crypto trading group',
-        'forex signal', 'binary options', 'daily profit', 'weekly returns',
-        'monthly guaranteed', 'whatsapp trading'
-    ]
-    
-    UNREALISTIC_RETURNS = [
-        'daily 1%', 'daily 2%', 'weekly 10%', 'monthly 15%', 'monthly 20%',
-        '100% in', '200% in', '500% in'
-    ]
-    
-    scam_hits = [s for s in SCAM_INDICATORS if s in message_lower]
-    red_flag_hits = [r for r in RED_FLAGS if r in message_lower]
-    unrealistic = [u for u in UNREALISTIC_RETURNS if u in message_lower]
+    scam_hits = [s for s in SCAM_INDICATORS if s in found]
+    red_flag_hits = [r for r in RED_FLAGS if r in found]
+    unrealistic = [u for u in UNREALISTIC_RETURNS if u in found]
     
     risk_score = 0.0
     if scam_hits:
@@ -604,7 +816,7 @@ def detect_investment_fraud(message: str) -> dict:
         risk_score = max(risk_score, 0.95)
     
     # Check for percentage claims
-    percent_match = re.search(r'(\d+)\s*%\s*(daily|weekly|monthly|per month|per day)', message_lower)
+    percent_match = RETURN_CLAIM_RE.search(message_lower) if '%' in message_lower else None
     if percent_match:
         percentage = int(percent_match.group(1))
         if percentage > 5:
@@ -612,18 +824,8 @@ def detect_investment_fraud(message: str) -> dict:
     
     risk_score = min(risk_score, 1.0)
     
-    if risk_score >= 0.8:
-        threat_level = 'CRITICAL'
-        action = '🚨 This is a PONZI SCHEME! Do NOT invest!'
-        hindi = '🚨 यह पोंजी स्कीम है! पैसे न लगाएं! SEBI पंजीकरण जांचें: sebi.gov.in'
-    elif risk_score >= 0.5:
-        threat_level = 'HIGH'
-        action = '⚠️ High risk of fraud. Verify SEBI registration before investing.'
-        hindi = '⚠️ धोखाधड़ी का खतरा। SEBI पंजीकरण जांचें।'
-    else:
-        threat_level = 'LOW'
-        action = 'Low risk. Still verify with SEBI before investing.'
-        hindi = 'कम जोखिम। फिर भी SEBI से जांचें।'
+    threat_level = INVESTMENT_THREAT_LEVELS[bisect_right(INVESTMENT_THREAT_THRESHOLDS, risk_score)]
+    action, hindi = INVESTMENT_ADVICE[threat_level]
     
     return {
         "status": "success",
@@ -654,6 +856,47 @@ def detect_investment_fraud(message: str) -> dict:
 # TOOL 7: EMERGENCY CONTACTS
 # =============================================================================
 
+# The contacts never change, so the payload is built once; each call returns
+# its own copy.
+EMERGENCY_CONTACTS = {
+    "status": "success",
+    "tool": "emergency_contacts",
+    "national_helplines": {
+        "cyber_crime": {
+            "number": "1930",
+            "description": "National Cyber Crime Helpline (24x7)"
+        },
+        "women_helpline": {
+            "number": "1091",
+            "description": "Women Helpline"
+        },
+        "senior_citizen": {
+            "number": "14567",
+            "description": "Elderline for Senior Citizens"
+        }
+    },
+    "online_portals": {
+        "cyber_crime": "https://cybercrime.gov.in",
+        "rbi_sachet": "https://sachet.rbi.org.in",
+        "sebi_scores": "https://scores.gov.in",
+        "irdai": "https://igms.irda.gov.in"
+    },
+    "bank_helplines": {
+        "sbi": "1800-11-2211",
+        "hdfc": "1800-202-6161",
+        "icici": "1800-102-4242",
+        "axis": "1800-419-5555"
+    },
+    "immediate_actions": [
+        "Call 1930 immediately if you've shared OTP/PIN",
+        "Block your cards via bank app",
+        "File FIR at nearest police station",
+        "Report on cybercrime.gov.in within 24 hours"
+    ],
+    "hindi": "साइबर अपराध हेल्पलाइन: 1930 | पोर्टल: cybercrime.gov.in"
+}
+
+
 def get_emergency_contacts() -> dict:
     """
     Returns emergency contact numbers and websites for reporting cyber fraud in India.
@@ -661,43 +904,7 @@ def get_emergency_contacts() -> dict:
     Returns:
         dict: Complete list of helplines and portals for different fraud types.
     """
-    return {
-        "status": "success",
-        "tool": "emergency_contacts",
-        "national_helplines": {
-            "cyber_crime": {
-                "number": "1930",
-                "description": "National Cyber Crime Helpline (24x7)"
-            },
-            "women_helpline": {
-                "number": "1091",
-                "description": "Women Helpline"
-            },
-            "senior_citizen": {
-                "number": "14567",
-                "description": "Elderline for Senior Citizens"
-            }
-        },
-        "online_portals": {
-            "cyber_crime": "https://cybercrime.gov.in",
-            "rbi_sachet": "https://sachet.rbi.org.in",
-            "sebi_scores": "https://scores.gov.in",
-            "irdai": "https://igms.irda.gov.in"
-        },
-        "bank_helplines": {
-            "sbi": "1800-11-2211",
-            "hdfc": "1800-202-6161",
-            "icici": "1800-102-4242",
-            "axis": "1800-419-5555"
-        },
-        "immediate_actions": [
-            "Call 1930 immediately if you've shared OTP/PIN",
-            "Block your cards via bank app",
-            "File FIR at nearest police station",
-            "Report on cybercrime.gov.in within 24 hours"
-        ],
-        "hindi": "साइबर अपराध हेल्पलाइन: 1930 | पोर्टल: cybercrime.gov.in"
-    }
+    return _copy_result(EMERGENCY_CONTACTS)
 
 
 # =============================================================================
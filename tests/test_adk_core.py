@@ -0,0 +1,113 @@
+"""
+Scalar ADK Core - orchestrator tests
+"""
+
+import asyncio
+
+import pytest
+
+from core.adk_core import (
+    AgentContext, AgentRole, BaseAgent, MultiAgentOrchestrator, Task, TaskStatus
+)
+
+
+class StepAgent(BaseAgent):
+    """Agent recording when it ran and which dependency results it saw"""
+
+    def __init__(self, agent_id: str, log: list, fail: bool = False):
+        super().__init__(agent_id, agent_id, AgentRole.WORKER, f"Test agent {agent_id}")
+        self.log = log
+        self.fail = fail
+
+    @property
+    def system_instruction(self) -> str:
+        return ""
+
+    async def _generate_response_async(self, task: Task):
+        self.log.append(('start', self.agent_id))
+        await asyncio.sleep(0)
+        self.log.append(('end', self.agent_id))
+        if self.fail:
+            raise RuntimeError(f"{self.agent_id} broke")
+        return {
+            'agent': self.agent_id,
+            'saw': sorted(task.context.metadata.get('previous_results', {}))
+        }
+
+
+def make_orchestrator(*agent_ids, failing=()):
+    log = []
+    orchestrator = MultiAgentOrchestrator()
+    for agent_id in agent_ids:
+        orchestrator.register_agent(StepAgent(agent_id, log, fail=agent_id in failing))
+    return orchestrator, log
+
+
+def make_task():
+    return Task(task_id='t', task_type='test', content='msg', context=AgentContext(session_id='s'))
+
+
+def run_dag(orchestrator, dependencies):
+    return asyncio.run(orchestrator.execute_dag(make_task(), dependencies))
+
+
+def test_execute_dag_runs_in_dependency_order():
+    orchestrator, log = make_orchestrator('a', 'b', 'c', 'd')
+    results = run_dag(orchestrator, {'a': [], 'b': ['a'], 'c': ['a'], 'd': ['b', 'c']})
+
+    assert [r.agent_id for r in results] == ['a', 'b', 'c', 'd']
+    assert all(r.status == TaskStatus.COMPLETED for r in results)
+    assert [r.result['saw'] for r in results] == [[], ['a'], ['a'], ['b', 'c']]
+
+    # b and c share a wave: both start before either ends, and after a ends
+    position = {event: index for index, event in enumerate(log)}
+    assert position[('end', 'a')] < position[('start', 'b')]
+    assert position[('start', 'c')] < position[('end', 'b')]
+    assert position[('end', 'c')] < position[('start', 'd')]
+
+
+def test_execute_dag_runs_agents_named_only_as_dependencies():
+    orchestrator, _ = make_orchestrator('a', 'b')
+    results = run_dag(orchestrator, {'b': ['a']})
+    assert [r.agent_id for r in results] == ['a', 'b']
+    assert results[1].result['saw'] == ['a']
+
+
+def test_execute_dag_passes_results_on_a_copied_context():
+    orchestrator, _ = make_orchestrator('a', 'b')
+    task = make_task()
+    asyncio.run(orchestrator.execute_dag(task, {'a': [], 'b': ['a']}))
+    assert 'previous_results' not in task.context.metadata
+
+
+def test_execute_dag_rejects_cycles_before_running():
+    orchestrator, log = make_orchestrator('a', 'b', 'c')
+    with pytest.raises(ValueError, match='cycle'):
+        run_dag(orchestrator, {'a': [], 'b': ['c'], 'c': ['b']})
+    assert log == []
+
+
+@pytest.mark.parametrize('dependencies', [
+    {'a': [], 'ghost': ['a']},
+    {'a': ['ghost']},
+])
+def test_execute_dag_rejects_unknown_agents_before_running(dependencies):
+    orchestrator, log = make_orchestrator('a')
+    with pytest.raises(ValueError, match='ghost'):
+        run_dag(orchestrator, dependencies)
+    assert log == []
+
+
+def test_execute_dag_propagates_failures_to_dependents():
+    orchestrator, log = make_orchestrator('a', 'b', 'c', 'd', failing={'a'})
+    results = {r.agent_id: r for r in run_dag(orchestrator, {'b': ['a'], 'c': ['b'], 'd': []})}
+
+    assert results['a'].status == TaskStatus.FAILED
+    assert results['b'].status == TaskStatus.FAILED
+    assert results['c'].status == TaskStatus.FAILED
+    assert 'a' in results['b'].result['error'] and 'b' in results['c'].result['error']
+    assert results['d'].status == TaskStatus.COMPLETED
+
+    # Dependents of a failure never run
+    assert ('start', 'b') not in log and ('start', 'c') not in log
+    assert [entry['agent_id'] for entry in orchestrator.get_execution_log()] == ['a', 'd', 'b', 'c']
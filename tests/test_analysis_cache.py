@@ -0,0 +1,72 @@
+"""
+Scalar Analysis Cache - tests
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from core.analysis_cache import LRUCache, cached_analysis, copy_result
+
+
+@dataclass(slots=True)
+class Finding:
+    name: str
+    details: Dict[str, Any]
+    tags: List[str]
+
+
+class Analyzer:
+    def __init__(self):
+        self.calls = 0
+
+    @cached_analysis(maxsize=2)
+    def analyze(self, text: str, features=None):
+        self.calls += 1
+        return {
+            'text': text,
+            'indicators': [{'indicator': 'a', 'risk': 0.9}],
+            'finding': Finding('f', {'risk': 'HIGH'}, ['x'])
+        }
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_cached_analysis_ignores_features_in_key():
+    analyzer = Analyzer()
+    analyzer.analyze('msg')
+    analyzer.analyze('msg', features=object())
+    assert analyzer.calls == 1
+
+
+def test_cached_results_are_copied_per_call():
+    analyzer = Analyzer()
+    first = analyzer.analyze('msg')
+    expected = copy.deepcopy(first)
+
+    first['text'] = 'annotated'
+    first['indicators'][0]['risk'] = 0.0
+    first['indicators'].append({})
+    first['finding'].details['risk'] = 'LOW'
+    first['finding'].tags.append('y')
+
+    assert analyzer.analyze('msg') == expected
+    assert analyzer.calls == 1
+
+
+def test_copy_result_shares_only_immutable_leaves():
+    finding = Finding('f', {'risk': 'HIGH'}, ['x'])
+    copied = copy_result({'findings': [finding], 'score': 0.5})
+    assert copied == {'findings': [finding], 'score': 0.5}
+    assert copied['findings'][0] is not finding
+    assert copied['findings'][0].details is not finding.details
+    assert copied['findings'][0].tags is not finding.tags
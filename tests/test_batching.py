@@ -0,0 +1,98 @@
+"""
+Scalar API Request Batching - tests
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from api.batching import AnalysisBatcher
+
+
+class RecordingAnalyzer:
+    """analyze_many stand-in recording each batch it is called with"""
+
+    def __init__(self, fail_ages=()):
+        self.batches = []
+        self.fail_ages = set(fail_ages)
+        self._lock = threading.Lock()
+
+    def __call__(self, messages, user_age):
+        with self._lock:
+            self.batches.append((list(messages), user_age))
+        if user_age in self.fail_ages:
+            raise RuntimeError(f'analysis failed for age {user_age}')
+        return [f'{message}@{user_age}' for message in messages]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_concurrent_requests_share_one_batch():
+    analyzer = RecordingAnalyzer()
+    batcher = AnalysisBatcher(analyzer, window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.analyze(f'm{i}', 45) for i in range(5)))
+
+    assert run(scenario()) == [f'm{i}@45' for i in range(5)]
+    assert analyzer.batches == [([f'm{i}' for i in range(5)], 45)]
+
+
+def test_batch_is_split_by_age():
+    analyzer = RecordingAnalyzer()
+    batcher = AnalysisBatcher(analyzer, window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.analyze('a', 45), batcher.analyze('b', 70), batcher.analyze('c', 45)
+        )
+
+    assert run(scenario()) == ['a@45', 'b@70', 'c@45']
+    assert sorted(analyzer.batches) == [(['a', 'c'], 45), (['b'], 70)]
+
+
+def test_requests_after_a_flush_start_a_new_batch():
+    analyzer = RecordingAnalyzer()
+    batcher = AnalysisBatcher(analyzer, window=0.005)
+
+    async def scenario():
+        first = await batcher.analyze('a')
+        second = await batcher.analyze('b')
+        return first, second
+
+    assert run(scenario()) == ('a@45', 'b@45')
+    assert analyzer.batches == [(['a'], 45), (['b'], 45)]
+
+
+def test_failure_reaches_only_its_age_group():
+    analyzer = RecordingAnalyzer(fail_ages={70})
+    batcher = AnalysisBatcher(analyzer, window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.analyze('a', 45), batcher.analyze('b', 70), batcher.analyze('c', 70),
+            return_exceptions=True
+        )
+
+    ok, failed_b, failed_c = run(scenario())
+    assert ok == 'a@45'
+    assert isinstance(failed_b, RuntimeError) and isinstance(failed_c, RuntimeError)
+
+
+def test_cancelled_request_does_not_affect_the_batch():
+    analyzer = RecordingAnalyzer()
+    batcher = AnalysisBatcher(analyzer, window=0.01)
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(batcher.analyze('gone'))
+        kept = asyncio.ensure_future(batcher.analyze('kept'))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await kept
+
+    assert run(scenario()) == 'kept@45'
@@ -0,0 +1,65 @@
+"""
+Scalar Financial Bodyguard - regression tests
+"""
+
+import copy
+from dataclasses import replace
+
+import pytest
+
+from agents.financial_bodyguard import FinancialBodyguardOrchestrator
+
+
+@pytest.fixture(scope="module")
+def bodyguard():
+    return FinancialBodyguardOrchestrator()
+
+
+def test_prescreen_passes_benign_ascii(bodyguard):
+    assert bodyguard.analyze("see you at dinner tonight").threat_level == "SAFE"
+
+
+# The keyword pre-screen must not wave through text that only the
+# specialists' IGNORECASE regexes recognize ('ſ' matches 's')
+def test_prescreen_keeps_non_ascii_lookalikes(bodyguard):
+    result = bodyguard.analyze("ſcreen ſhare anydeſk")
+    assert result.threat_level == "CRITICAL"
+    assert result.risk_score == 0.95
+
+
+def test_memoized_results_are_not_shared(bodyguard):
+    message = "cbi officer: arrest warrant issued, pay fine now. kyc update bit.ly/x"
+    first = bodyguard.analyze(message)
+    expected = copy.deepcopy(bodyguard.analyze(message))
+    
+    first.recommendations.clear()
+    first.agent_findings[0]['risk_score'] = 0.0
+    if first.matched_trajectory is not None:
+        first.matched_trajectory['id'] = 'annotated'
+    
+    again = bodyguard.analyze(message)
+    assert again.recommendations == expected.recommendations
+    assert again.agent_findings == expected.agent_findings
+    assert again.matched_trajectory == expected.matched_trajectory
+    assert bodyguard.analyze_many([message])[0].agent_findings == expected.agent_findings
+
+
+# Every message of a batch gets the result analyze() would give it alone
+@pytest.mark.parametrize("user_age", [45, 72])
+def test_analyze_many_matches_analyze(user_age):
+    messages = [
+        "see you at dinner tonight",
+        "cbi officer: arrest warrant issued, pay fine now",
+        "kyc update pending, download app from bit.ly/x",
+        "guaranteed 40% monthly returns, double your money",
+        "collect request: accept to receive your cashback",
+        "ſcreen ſhare anydeſk",
+        "cbi officer: arrest warrant issued, pay fine now",
+        "",
+    ]
+    single = FinancialBodyguardOrchestrator()
+    batched = FinancialBodyguardOrchestrator()
+    
+    expected = [replace(single.analyze(message, user_age), timestamp='') for message in messages]
+    results = batched.analyze_many(messages, user_age)
+    assert [replace(result, timestamp='') for result in results] == expected
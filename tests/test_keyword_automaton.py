@@ -0,0 +1,175 @@
+"""
+Scalar Keyword Automaton - tests
+
+Every engine backend must report exactly what plain substring checks would.
+"""
+
+import random
+import re
+
+import pytest
+
+from agents import tools
+from core import keyword_automaton
+from core.keyword_automaton import KeywordAutomaton, PatternMatcher, SHORT_TEXT_LIMIT, literal_prefix
+
+
+# backend -> (use Hyperscan, use pyahocorasick)
+BACKENDS = {
+    'hyperscan': (True, False),
+    'ahocorasick': (False, True),
+    'hyperscan+ahocorasick': (True, True),
+    'plain': (False, False),
+}
+
+# Overlapping, nested and non-ASCII keywords, plus single characters that
+# bypass the engines
+GROUPS = {
+    'overlap': ['ab', 'abc', 'bca', 'ca', 'cab'],
+    'money': ['₹', 'rs', 'lakh'],
+    'non_ascii': ['é1', 'नमस्ते', 'न', 'bé'],
+    'shared': ['abc', 'x'],
+}
+KEYWORDS = [keyword for keywords in GROUPS.values() for keyword in keywords]
+ALPHABET = 'abcrslkhx1 é₹नमस्ते\n'
+
+
+def random_texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    texts = ['', 'abc', 'cab₹', 'नमस्ते', 'x' * (SHORT_TEXT_LIMIT + 5) + 'bca']
+    for _ in range(count):
+        length = rng.choice([rng.randint(0, 40), rng.randint(SHORT_TEXT_LIMIT, 3 * SHORT_TEXT_LIMIT)])
+        texts.append(''.join(rng.choice(ALPHABET) for _ in range(length)))
+    return texts
+
+
+def expected_find(text: str):
+    return {keyword for keyword in KEYWORDS if keyword in text}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request, monkeypatch):
+    use_hyperscan, use_ahocorasick = BACKENDS[request.param]
+    if use_hyperscan and not keyword_automaton.HYPERSCAN_AVAILABLE:
+        pytest.skip('hyperscan not installed')
+    if use_ahocorasick and not keyword_automaton.AHOCORASICK_AVAILABLE:
+        pytest.skip('pyahocorasick not installed')
+    monkeypatch.setattr(keyword_automaton, 'HYPERSCAN_AVAILABLE', use_hyperscan)
+    monkeypatch.setattr(keyword_automaton, 'AHOCORASICK_AVAILABLE', use_ahocorasick)
+    return use_hyperscan, use_ahocorasick
+
+
+@pytest.fixture
+def automaton(backend):
+    automaton = KeywordAutomaton(GROUPS)
+    use_hyperscan, use_ahocorasick = backend
+    assert (automaton._database is not None) == use_hyperscan
+    assert (automaton._automaton is not None) == use_ahocorasick
+    return automaton
+
+
+def test_keywords_are_distinct_in_declaration_order(automaton):
+    assert automaton.keywords == tuple(dict.fromkeys(KEYWORDS))
+
+
+def test_find_matches_substring_checks(automaton):
+    for text in random_texts(300):
+        assert automaton.find(text) == expected_find(text), text
+
+
+def test_scan_reports_groups_in_declaration_order(automaton):
+    for text in random_texts(100, seed=1):
+        assert automaton.scan(text) == {
+            name: [keyword for keyword in keywords if keyword in text]
+            for name, keywords in GROUPS.items()
+        }
+
+
+def test_single_character_keywords_only():
+    automaton = KeywordAutomaton({'currency': ['₹', '$']})
+    assert automaton.find('pay ₹500') == {'₹'}
+    assert automaton.find('$1 or ₹1') == {'₹', '$'}
+    assert automaton.find_many(['$1', 'none', '₹ and $']) == [{'$'}, set(), {'₹', '$'}]
+
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('anydesk', ('anydesk', True)),
+    (r'bit\.ly', ('bit.ly', True)),
+    ('pre-?existing', ('pre', False)),
+    (r'bit\.?ly', ('bit', False)),
+    ('screen.*share', ('screen', False)),
+    ('ab+c', ('ab', False)),
+    ('ab{2}', ('a', False)),
+    ('ab*', ('a', False)),
+    (r'\d+ days', ('', False)),
+    (r'\bfee', ('', False)),
+    ('(a)b', ('', False)),
+    ('a|b', ('', False)),
+    ('apk|download', ('', False)),
+])
+def test_literal_prefix(pattern, expected):
+    assert literal_prefix(pattern) == expected
+
+
+PATTERN_GROUPS = {
+    'literal': ['anydesk', r'bit\.ly'],
+    'optional': ['pre-?existing', r'(\d+)\s*(days?|months?)'],
+    'guarded': ['screen.*share', 'share.*otp'],
+    'choice': ['apk|download app'],
+}
+PATTERN_WORDS = [
+    'anydesk', 'bit.ly', 'bitxly', 'pre-existing', 'preexisting', 'pre existing',
+    'screen', 'share', 'otp', 'apk', 'download app', '30 days', '2months', 'x'
+]
+
+
+def expected_matching(groups, text):
+    return {
+        name for name, patterns in groups.items()
+        if any(re.search(pattern, text) for pattern in patterns)
+    }
+
+
+def test_pattern_matcher_matches_re(backend):
+    matcher = PatternMatcher(PATTERN_GROUPS)
+    rng = random.Random(3)
+    for _ in range(300):
+        text = ' '.join(rng.choice(PATTERN_WORDS) for _ in range(rng.randint(0, 8)))
+        assert matcher.matching(text) == expected_matching(PATTERN_GROUPS, text), text
+
+
+@pytest.mark.parametrize('tool, attribute', [
+    ('KYCPhishingDetector', 'PHISHING_INDICATORS'),
+    ('LoanAgreementDecoder', 'DANGER_TERMS'),
+    ('InsurancePolicyDecoder', 'CRITICAL_EXCLUSIONS'),
+])
+def test_pattern_matcher_matches_re_on_tool_patterns(backend, tool, attribute):
+    definitions = getattr(getattr(tools, tool), attribute)
+    groups = {name: data['patterns'] for name, data in definitions.items()}
+    matcher = PatternMatcher(groups)
+    # Texts built from the words in the patterns, so that many of them match
+    words = [
+        word for patterns in groups.values() for pattern in patterns
+        for word in re.findall(r'[a-z]+', pattern)
+    ]
+    rng = random.Random(4)
+    for _ in range(200):
+        text = ' '.join(rng.choice(words + ['30 days', '-', '.', '%']) for _ in range(rng.randint(0, 12)))
+        assert matcher.matching(text) == expected_matching(groups, text), text
+
+
+def test_find_many_matches_find(automaton):
+    texts = random_texts(200, seed=2)
+    assert automaton.find_many(texts) == [automaton.find(text) for text in texts]
+
+
+def test_find_many_does_not_match_across_texts(automaton):
+    # 'ab' + 'c' would be 'abc' if the texts were joined without a separator
+    texts = ['xab', 'cx', 'b', 'ca', 'नमस', 'ते']
+    assert automaton.find_many(texts) == [expected_find(text) for text in texts]
+
+
+@pytest.mark.parametrize('texts', [[], ['abc'], ['', ''], ['abc', 'abc']])
+def test_find_many_edge_batches(automaton, texts):
+    assert automaton.find_many(texts) == [expected_find(text) for text in texts]
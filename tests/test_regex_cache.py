@@ -0,0 +1,24 @@
+"""
+Scalar Regex Cache - tests
+"""
+
+import re
+import unicodedata
+
+import pytest
+
+from core import regex_cache
+
+
+# The hard-coded classes must be exactly what `re` matches on this Python
+@pytest.mark.parametrize('escape', ['d', 's'])
+def test_class_ranges_match_re(escape):
+    if unicodedata.unidata_version != regex_cache._CLASS_UNICODE_VERSION:
+        pytest.skip('class ranges are for another Unicode version')
+    pattern = re.compile('\\' + escape)
+    expected = [code_point for code_point in range(0x110000) if pattern.match(chr(code_point))]
+    table = [
+        code_point for start, end in regex_cache._CLASS_RANGES[escape]
+        for code_point in range(start, end + 1)
+    ]
+    assert table == expected
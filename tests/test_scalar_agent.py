@@ -0,0 +1,39 @@
+"""
+Scalar ADK Agent tools - regression tests
+"""
+
+import pytest
+
+import scalar_agent
+
+
+# Memoized detectors must hand every caller its own result
+@pytest.mark.parametrize("detector, message", [
+    (scalar_agent.detect_upi_scam, "collect request urgent, claim prize"),
+    (scalar_agent.detect_kyc_phishing, "kyc update pending, download app bit.ly/x"),
+    (scalar_agent.detect_police_impersonation, "cbi officer: arrest warrant, pay fine"),
+    (scalar_agent.detect_investment_fraud, "guaranteed 40% monthly returns, join now"),
+])
+def test_detector_results_are_not_shared(detector, message):
+    first = detector(message)
+    expected = detector(message)
+    assert first == expected and first is not expected
+    
+    first['risk_score'] = -1
+    for value in first.values():
+        if isinstance(value, list):
+            value.append('annotation')
+        elif isinstance(value, dict):
+            value['annotation'] = True
+    
+    assert detector(message) == expected
+
+
+def test_emergency_contacts_are_not_shared():
+    contacts = scalar_agent.get_emergency_contacts()
+    contacts['status'] = 'annotated'
+    contacts['immediate_actions'].append('annotation')
+    contacts['national_helplines']['cyber_crime']['number'] = '0'
+    
+    assert scalar_agent.get_emergency_contacts() == scalar_agent.EMERGENCY_CONTACTS
+    assert scalar_agent.EMERGENCY_CONTACTS['national_helplines']['cyber_crime']['number'] == '1930'
@@ -0,0 +1,72 @@
+"""
+Scalar Specialist Agents - regression tests
+"""
+
+import pytest
+
+from core.adk_core import AgentContext, Task
+from agents.specialists import PhishingAgent, ImpersonationAgent
+
+
+@pytest.fixture(scope="module")
+def phishing_agent():
+    return PhishingAgent()
+
+
+@pytest.fixture(scope="module")
+def impersonation_agent():
+    return ImpersonationAgent()
+
+
+# The indicator regexes run with IGNORECASE, which matches these non-ASCII
+# letters to ASCII ones - the literal-anchor prefilter must not skip them
+@pytest.mark.parametrize("message, indicator", [
+    ("ſbi account update now", "fake_bank"),          # long s
+    ("ſcreen ſhare with our agent", "screen_share"),
+    ("install anydesK for support", "screen_share"),  # Kelvin sign
+])
+def test_phishing_indicators_fold_non_ascii(phishing_agent, message, indicator):
+    result = phishing_agent.analyze(message)
+    assert indicator in [found['indicator'] for found in result['indicators']]
+
+
+def test_phishing_prefilter_matches_ascii(phishing_agent):
+    result = phishing_agent.analyze("sbi account update now")
+    assert [found['indicator'] for found in result['indicators']] == ['fake_bank']
+    assert result['risk_score'] == 0.9
+
+
+# 'rs' counts written against the amount, but not inside ordinary words
+@pytest.mark.parametrize("message, money", [
+    ("police officer here, send Rs5000", ['rs']),
+    ("police officer here, send Rs.5000", ['rs']),
+    ("police officer here, send Rs 5000", ['rs']),
+    ("police officer here, call back within 2 hours", []),
+    ("police officer here, your refund is credited", []),
+])
+def test_impersonation_rupee_abbreviation(impersonation_agent, message, money):
+    assert impersonation_agent.analyze(message)['money_demands'] == money
+
+
+@pytest.mark.parametrize("message, authority", [
+    ("ed officer calling about your account", ['ed']),
+    ("your linked account is blocked", []),
+    ("first notice from the fir desk", ['fir']),
+])
+def test_impersonation_short_abbreviations_stand_alone(impersonation_agent, message, authority):
+    assert impersonation_agent.analyze(message)['authority_claims'] == authority
+
+
+# analyze() results are memoized; the Task path must not expose the cached dict
+def test_task_output_does_not_alias_cache(phishing_agent):
+    task = Task(
+        task_id='t',
+        task_type='phishing',
+        content='kyc update now, download app',
+        context=AgentContext(session_id='s')
+    )
+    first = phishing_agent._generate_response(task)
+    first['indicators'].clear()
+    first['risk_score'] = 0.0
+    assert phishing_agent._generate_response(task) == phishing_agent.analyze(task.content)
+    assert phishing_agent.analyze(task.content)['risk_score'] > 0.5
@@ -0,0 +1,24 @@
+"""
+Scalar Tools - regression tests
+"""
+
+import pytest
+
+from agents.tools import LoanAgreementDecoder, InsurancePolicyDecoder
+
+
+# Clean documents share one outcome, but never one result object
+@pytest.mark.parametrize("decoder_class, findings_key", [
+    (LoanAgreementDecoder, "found_terms"),
+    (InsurancePolicyDecoder, "exclusions"),
+])
+def test_clean_results_are_not_shared(decoder_class, findings_key):
+    decoder = decoder_class()
+    first = decoder.analyze("This agreement is between the two parties named above.")
+    first.result[findings_key].append("annotation")
+    first.confidence = 0.0
+
+    second = decoder.analyze("Both parties have read and accepted the terms.")
+    assert second.result[findings_key] == []
+    assert second.confidence > 0.0
+    assert second.result is not first.result